@@ -3,912 +3,840 @@ Module CRUD pour le simulateur SAP PM
 Contient toutes les opérations CRUD pour les entités SAP PM
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Generic, Type, TypeVar
+from cachetools import TTLCache
 from fastapi import HTTPException
-from database import get_database, generate_id
+from pydantic import BaseModel
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.asynchronous.collection import AsyncCollection
+from redis.exceptions import RedisError
+from database import get_collection, get_redis, generate_id, insert_in_batches, to_document, from_document
 from schemas import *
 
+# Pagination des listes: taille de page par défaut et maximale, taille des lots du curseur
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CURSOR_BATCH_SIZE = 500
+
+# Cache en mémoire des données de configuration (peu modifiées, très lues)
+CONFIG_CACHE_MAX_SIZE = 1024
+CONFIG_CACHE_TTL_SECONDS = 60
+
+# Cache des IDs introuvables: les lectures répétées d'un ID absent ne retournent pas en base.
+# Propre au processus; une création faite par un autre worker est visible après au plus ce délai
+MISS_CACHE_MAX_SIZE = 10_000
+MISS_CACHE_TTL_SECONDS = 5
+
+# Cache partagé (Redis) des lectures par ID des données transactionnelles, invalidé à chaque écriture.
+# L'invalidation pose un marqueur vide de courte durée et les lectures n'écrivent qu'une clé absente:
+# une lecture concurrente d'une écriture ne peut pas remettre l'ancienne version en cache
+SHARED_CACHE_TTL_SECONDS = 300
+SHARED_CACHE_TOMBSTONE_TTL_SECONDS = 5
+
+# Les documents MongoDB ont été validés à l'écriture: les lectures utilisent model_construct sans revalidation
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Valeurs par défaut des champs optionnels par modèle: complètent les documents bruts, stockés sans les None
+_document_defaults: Dict[Type[BaseModel], Dict[str, Any]] = {}
+
+def document_defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Retourne (et mémorise) les valeurs par défaut des champs optionnels d'un modèle"""
+    defaults = _document_defaults.get(model)
+    if defaults is None:
+        defaults = {name: field.get_default(call_default_factory=True) for name, field in model.model_fields.items() if not field.is_required()}
+        _document_defaults[model] = defaults
+    return defaults
+
+async def iter_documents(collection_name: str, model: Type[BaseModel], skip: int = 0, limit: int = DEFAULT_PAGE_SIZE, fields: Optional[List[str]] = None, query: Optional[Dict[str, Any]] = None, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Parcourt une page de documents bruts au format de réponse, sans construire de modèles Pydantic
+
+    Avec `fields`, seuls ces champs (et l'ID) sont lus et renvoyés. Avec `after` (ID du dernier
+    document de la page précédente), la page démarre par un saut dans l'index `_id` plutôt qu'un `skip`.
+    """
+    defaults = {field: value for field, value in document_defaults(model).items() if field in fields} if fields else document_defaults(model)
+    query = dict(query or {})
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    cursor = get_collection(collection_name).find(query, projection=fields).sort("_id", 1).skip(skip).limit(limit).batch_size(CURSOR_BATCH_SIZE)
+    async for result in cursor:
+        yield {**defaults, **from_document(result)}
+
+async def shared_cache_get(key: str) -> Optional[bytes]:
+    """Lit une entrée JSON du cache partagé (None si absent, désactivé ou indisponible, vide si invalidée)"""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        return await redis.get(key)
+    except RedisError:
+        return None
+
+async def shared_cache_set(key: str, item: BaseModel):
+    """Écrit une entrée dans le cache partagé avec expiration, sauf si la clé existe (entrée ou invalidation récente)"""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(key, item.model_dump_json(), ex=SHARED_CACHE_TTL_SECONDS, nx=True)
+    except RedisError:
+        pass
+
+async def shared_cache_invalidate(*keys: str):
+    """Remplace des entrées du cache partagé par un marqueur vide après une écriture"""
+    redis = get_redis()
+    if redis is None or not keys:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.set(key, b"", ex=SHARED_CACHE_TOMBSTONE_TTL_SECONDS)
+            await pipeline.execute()
+    except RedisError:
+        pass
+
+async def replace_in_bulk(collection: AsyncCollection, items: List[BaseModel]) -> int:
+    """Remplace des entrées existantes (clé: ID) en une seule écriture, renvoie le nombre d'entrées trouvées"""
+    if not items:
+        return 0
+    missing = [index for index, item in enumerate(items) if not item.id]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"ID obligatoire pour une mise à jour groupée (positions: {', '.join(map(str, missing))})")
+    result = await collection.bulk_write([ReplaceOne({"_id": item.id}, to_document(item)) for item in items], ordered=False)
+    return result.matched_count
+
+async def delete_in_bulk(collection: AsyncCollection, item_ids: List[str]) -> int:
+    """Supprime des entrées par ID en une seule écriture, renvoie le nombre d'entrées supprimées"""
+    if not item_ids:
+        return 0
+    result = await collection.bulk_write([DeleteOne({"_id": item_id}) for item_id in item_ids], ordered=False)
+    return result.deleted_count
+
+# ============================================================================
+# DÉPÔT CRUD GÉNÉRIQUE
+# ============================================================================
+
+class CRUDRepository(Generic[ModelT]):
+    """Opérations CRUD d'une entité SAP PM stockée dans une collection MongoDB"""
+
+    def __init__(self, collection_name: str, model: Type[ModelT], not_found_detail: str, cached: bool = False, shared_cache: bool = False, keep_ids: bool = False):
+        self.collection_name = collection_name
+        self.model = model
+        self.not_found_detail = not_found_detail
+        # Cache par ID, propre au processus: les entrées expirent après CONFIG_CACHE_TTL_SECONDS
+        self.cache: Optional[TTLCache] = TTLCache(maxsize=CONFIG_CACHE_MAX_SIZE, ttl=CONFIG_CACHE_TTL_SECONDS) if cached else None
+        # IDs récemment introuvables (retirés à chaque création ou écriture sur cet ID)
+        self.misses: TTLCache = TTLCache(maxsize=MISS_CACHE_MAX_SIZE, ttl=MISS_CACHE_TTL_SECONDS)
+        # Cache partagé Redis des lectures par ID (clé "<collection>:<id>")
+        self.shared_cache = shared_cache
+        # Conserve l'ID fourni par le client à la création au lieu de toujours le régénérer
+        self.keep_ids = keep_ids
+
+    @property
+    def collection(self) -> AsyncCollection:
+        return get_collection(self.collection_name)
+
+    def assign_id(self, item: ModelT):
+        """Attribue un nouvel ID à une entrée avant sa création"""
+        if not (self.keep_ids and item.id):
+            item.id = generate_id()
+
+    def cache_key(self, item_id: str) -> str:
+        return f"{self.collection_name}:{item_id}"
+
+    async def create(self, item: ModelT) -> ModelT:
+        """Crée une nouvelle entrée"""
+        self.assign_id(item)
+        try:
+            await self.collection.insert_one(to_document(item))
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=f"ID déjà existant: {item.id}")
+        self.misses.pop(item.id, None)
+        return item
+
+    async def create_many(self, items: List[ModelT]) -> List[ModelT]:
+        """Crée plusieurs entrées en une seule écriture"""
+        for item in items:
+            self.assign_id(item)
+        try:
+            await insert_in_batches(self.collection, items)
+        except BulkWriteError as error:
+            # Insertion non ordonnée, lot par lot jusqu'au dernier: seuls les doublons sont rejetés
+            duplicates = [write_error["op"]["_id"] for write_error in error.details.get("writeErrors", []) if write_error.get("code") == 11000]
+            if not duplicates:
+                raise
+            raise HTTPException(status_code=409, detail=f"IDs déjà existants, non créés (les autres entrées ont été créées): {', '.join(map(str, duplicates))}")
+        finally:
+            for item in items:
+                self.misses.pop(item.id, None)
+        return items
+
+    async def upsert_many(self, items: List[ModelT]) -> List[ModelT]:
+        """Crée ou remplace plusieurs entrées (clé: ID) en une seule écriture idempotente"""
+        for item in items:
+            if not item.id:
+                item.id = generate_id()
+        if items:
+            await self.collection.bulk_write([ReplaceOne({"_id": item.id}, to_document(item), upsert=True) for item in items], ordered=False)
+            await self.invalidate(*(item.id for item in items))
+        return items
+
+    async def get(self, item_id: str) -> Optional[ModelT]:
+        """Récupère une entrée par ID"""
+        if item_id in self.misses:
+            return None
+        if self.cache is not None:
+            item = self.cache.get(item_id)
+            if item is not None:
+                return item
+        if self.shared_cache:
+            cached = await shared_cache_get(self.cache_key(item_id))
+            if cached:
+                return self.model.model_validate_json(cached)
+        result = await self.collection.find_one({"_id": item_id})
+        if not result:
+            self.misses[item_id] = True
+            return None
+        item = self.model.model_construct(**from_document(result))
+        if self.cache is not None:
+            self.cache[item_id] = item
+        if self.shared_cache:
+            await shared_cache_set(self.cache_key(item_id), item)
+        return item
+
+    async def get_many(self, item_ids: List[str]) -> List[ModelT]:
+        """Récupère plusieurs entrées par ID en une seule requête, dans l'ordre demandé"""
+        cursor = self.collection.find({"_id": {"$in": item_ids}}).batch_size(CURSOR_BATCH_SIZE)
+        found = {result["_id"]: result async for result in cursor}
+        return [self.model.model_construct(**from_document(found.pop(item_id))) for item_id in item_ids if item_id in found]
+
+    async def iter_all(self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[ModelT]:
+        """Parcourt une page d'entrées lot par lot, sans la charger entièrement en mémoire"""
+        cursor = self.collection.find().skip(skip).limit(limit).batch_size(CURSOR_BATCH_SIZE)
+        async for result in cursor:
+            yield self.model.model_construct(**from_document(result))
+
+    async def get_all(self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> List[ModelT]:
+        """Récupère une page d'entrées (documents validés à l'écriture, non revalidés)"""
+        return [item async for item in self.iter_all(skip, limit)]
+
+    async def find_by(self, query: Dict[str, Any], skip: int = 0, limit: int = 0) -> List[ModelT]:
+        """Récupère les entrées correspondant à un filtre (limit=0: sans limite)
+
+        Une recherche paginée est triée par ID pour que les pages successives restent stables.
+        """
+        cursor = self.collection.find(query)
+        if skip or limit:
+            cursor = cursor.sort("_id", 1)
+        cursor = cursor.skip(skip).limit(limit).batch_size(CURSOR_BATCH_SIZE)
+        return [self.model.model_construct(**from_document(result)) async for result in cursor]
+
+    async def update(self, item_id: str, item: ModelT) -> ModelT:
+        """Met à jour une entrée"""
+        item.id = item_id
+        doc = await self.collection.find_one_and_replace({"_id": item_id}, to_document(item), return_document=ReturnDocument.AFTER)
+        await self.invalidate(item_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail=self.not_found_detail)
+        return self.model.model_construct(**from_document(doc))
+
+    async def patch(self, item_id: str, changes: Dict[str, Any]) -> ModelT:
+        """Met à jour partiellement une entrée: $set des champs fournis, $unset de ceux remis à None"""
+        to_set = {field: value for field, value in changes.items() if value is not None}
+        to_unset = {field: "" for field, value in changes.items() if value is None}
+        required = [field for field in to_unset if self.model.model_fields[field].is_required()]
+        if required:
+            raise HTTPException(status_code=422, detail=f"Champs obligatoires: {', '.join(required)}")
+        update = {}
+        if to_set:
+            update["$set"] = to_set
+        if to_unset:
+            update["$unset"] = to_unset
+        if update:
+            doc = await self.collection.find_one_and_update({"_id": item_id}, update, return_document=ReturnDocument.AFTER)
+            await self.invalidate(item_id)
+        else:
+            doc = await self.collection.find_one({"_id": item_id})
+        if doc is None:
+            raise HTTPException(status_code=404, detail=self.not_found_detail)
+        return self.model.model_construct(**from_document(doc))
+
+    async def delete(self, item_id: str) -> bool:
+        """Supprime une entrée"""
+        deleted = await self.collection.find_one_and_delete({"_id": item_id}, projection={"_id": 1})
+        await self.invalidate(item_id)
+        return deleted is not None
+
+    async def update_many(self, items: List[ModelT]) -> int:
+        """Met à jour plusieurs entrées en une seule écriture"""
+        matched = await replace_in_bulk(self.collection, items)
+        await self.invalidate(*(item.id for item in items))
+        return matched
+
+    async def delete_many(self, item_ids: List[str]) -> int:
+        """Supprime plusieurs entrées en une seule écriture"""
+        deleted = await delete_in_bulk(self.collection, item_ids)
+        await self.invalidate(*item_ids)
+        return deleted
+
+    async def invalidate(self, *item_ids: str):
+        """Retire des entrées des caches après une écriture"""
+        for item_id in item_ids:
+            self.misses.pop(item_id, None)
+        if self.cache is not None:
+            for item_id in item_ids:
+                self.cache.pop(item_id, None)
+        if self.shared_cache:
+            await shared_cache_invalidate(*(self.cache_key(item_id) for item_id in item_ids))
+
 # ============================================================================
 # CRUD OPERATIONS FOR CATALOG
 # ============================================================================
 
-async def create_catalog(catalog: Catalog) -> Catalog:
-    """Crée un nouveau catalogue"""
-    catalog.id = generate_id()
-    db = get_database()
-    await db.catalogs.insert_one(catalog.dict())
-    return catalog
-
-async def get_catalog(catalog_id: str) -> Optional[Catalog]:
-    """Récupère un catalogue par ID"""
-    db = get_database()
-    result = await db.catalogs.find_one({"id": catalog_id})
-    return Catalog(**result) if result else None
-
-async def get_all_catalogs() -> List[Catalog]:
-    """Récupère tous les catalogues"""
-    db = get_database()
-    results = await db.catalogs.find().to_list(length=None)
-    return [Catalog(**result) for result in results]
-
-async def update_catalog(catalog_id: str, catalog: Catalog) -> Catalog:
-    """Met à jour un catalogue"""
-    catalog.id = catalog_id
-    db = get_database()
-    result = await db.catalogs.replace_one({"id": catalog_id}, catalog.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Catalogue non trouvé")
-    return catalog
-
-async def delete_catalog(catalog_id: str) -> bool:
-    """Supprime un catalogue"""
-    db = get_database()
-    result = await db.catalogs.delete_one({"id": catalog_id})
-    return result.deleted_count > 0
+catalogs_crud = CRUDRepository("catalogs", Catalog, "Catalogue non trouvé", cached=True)
+create_catalog = catalogs_crud.create
+get_catalog = catalogs_crud.get
+get_many_catalogs = catalogs_crud.get_many
+iter_catalogs = catalogs_crud.iter_all
+get_all_catalogs = catalogs_crud.get_all
+update_catalog = catalogs_crud.update
+update_many_catalogs = catalogs_crud.update_many
+delete_catalog = catalogs_crud.delete
+delete_many_catalogs = catalogs_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR PERMIT
 # ============================================================================
 
-async def create_permit(permit: Permit) -> Permit:
-    """Crée un nouveau permis"""
-    permit.id = generate_id()
-    db = get_database()
-    await db.permits.insert_one(permit.dict())
-    return permit
-
-async def get_permit(permit_id: str) -> Optional[Permit]:
-    """Récupère un permis par ID"""
-    db = get_database()
-    result = await db.permits.find_one({"id": permit_id})
-    return Permit(**result) if result else None
-
-async def get_all_permits() -> List[Permit]:
-    """Récupère tous les permis"""
-    db = get_database()
-    results = await db.permits.find().to_list(length=None)
-    return [Permit(**result) for result in results]
-
-async def update_permit(permit_id: str, permit: Permit) -> Permit:
-    """Met à jour un permis"""
-    permit.id = permit_id
-    db = get_database()
-    result = await db.permits.replace_one({"id": permit_id}, permit.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Permis non trouvé")
-    return permit
-
-async def delete_permit(permit_id: str) -> bool:
-    """Supprime un permis"""
-    db = get_database()
-    result = await db.permits.delete_one({"id": permit_id})
-    return result.deleted_count > 0
+permits_crud = CRUDRepository("permits", Permit, "Permis non trouvé", cached=True)
+create_permit = permits_crud.create
+get_permit = permits_crud.get
+get_many_permits = permits_crud.get_many
+iter_permits = permits_crud.iter_all
+get_all_permits = permits_crud.get_all
+update_permit = permits_crud.update
+update_many_permits = permits_crud.update_many
+delete_permit = permits_crud.delete
+delete_many_permits = permits_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR CHARACTERISTIC
 # ============================================================================
 
-async def create_characteristic(characteristic: Characteristic) -> Characteristic:
-    """Crée une nouvelle caractéristique"""
-    characteristic.id = generate_id()
-    await get_database().characteristics.insert_one(characteristic.dict())
-    return characteristic
-
-async def get_characteristic(characteristic_id: str) -> Optional[Characteristic]:
-    """Récupère une caractéristique par ID"""
-    result = await get_database().characteristics.find_one({"id": characteristic_id})
-    return Characteristic(**result) if result else None
-
-async def get_all_characteristics() -> List[Characteristic]:
-    """Récupère toutes les caractéristiques"""
-    results = await get_database().characteristics.find().to_list(length=None)
-    return [Characteristic(**result) for result in results]
-
-async def update_characteristic(characteristic_id: str, characteristic: Characteristic) -> Characteristic:
-    """Met à jour une caractéristique"""
-    characteristic.id = characteristic_id
-    result = await get_database().characteristics.replace_one({"id": characteristic_id}, characteristic.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Caractéristique non trouvée")
-    return characteristic
-
-async def delete_characteristic(characteristic_id: str) -> bool:
-    """Supprime une caractéristique"""
-    result = await get_database().characteristics.delete_one({"id": characteristic_id})
-    return result.deleted_count > 0
+characteristics_crud = CRUDRepository("characteristics", Characteristic, "Caractéristique non trouvée", cached=True)
+create_characteristic = characteristics_crud.create
+get_characteristic = characteristics_crud.get
+get_many_characteristics = characteristics_crud.get_many
+iter_characteristics = characteristics_crud.iter_all
+get_all_characteristics = characteristics_crud.get_all
+update_characteristic = characteristics_crud.update
+update_many_characteristics = characteristics_crud.update_many
+delete_characteristic = characteristics_crud.delete
+delete_many_characteristics = characteristics_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR CLASS
 # ============================================================================
 
-async def create_class(cls: Class) -> Class:
-    """Crée une nouvelle classe"""
-    cls.id = generate_id()
-    await get_database().classes.insert_one(cls.dict())
-    return cls
-
-async def get_class(class_id: str) -> Optional[Class]:
-    """Récupère une classe par ID"""
-    result = await get_database().classes.find_one({"id": class_id})
-    return Class(**result) if result else None
-
-async def get_all_classes() -> List[Class]:
-    """Récupère toutes les classes"""
-    results = await get_database().classes.find().to_list(length=None)
-    return [Class(**result) for result in results]
-
-async def update_class(class_id: str, cls: Class) -> Class:
-    """Met à jour une classe"""
-    cls.id = class_id
-    result = await get_database().classes.replace_one({"id": class_id}, cls.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Classe non trouvée")
-    return cls
-
-async def delete_class(class_id: str) -> bool:
-    """Supprime une classe"""
-    result = await get_database().classes.delete_one({"id": class_id})
-    return result.deleted_count > 0
+classes_crud = CRUDRepository("classes", Class, "Classe non trouvée", cached=True)
+create_class = classes_crud.create
+get_class = classes_crud.get
+get_many_classes = classes_crud.get_many
+iter_classes = classes_crud.iter_all
+get_all_classes = classes_crud.get_all
+update_class = classes_crud.update
+update_many_classes = classes_crud.update_many
+delete_class = classes_crud.delete
+delete_many_classes = classes_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR MAINTENANCE STRATEGY
 # ============================================================================
 
-async def create_maintenance_strategy(strategy: MaintenanceStrategy) -> MaintenanceStrategy:
-    """Crée une nouvelle stratégie de maintenance"""
-    strategy.id = generate_id()
-    await get_database().maintenance_strategies.insert_one(strategy.dict())
-    return strategy
-
-async def get_maintenance_strategy(strategy_id: str) -> Optional[MaintenanceStrategy]:
-    """Récupère une stratégie de maintenance par ID"""
-    result = await get_database().maintenance_strategies.find_one({"id": strategy_id})
-    return MaintenanceStrategy(**result) if result else None
-
-async def get_all_maintenance_strategies() -> List[MaintenanceStrategy]:
-    """Récupère toutes les stratégies de maintenance"""
-    results = await get_database().maintenance_strategies.find().to_list(length=None)
-    return [MaintenanceStrategy(**result) for result in results]
-
-async def update_maintenance_strategy(strategy_id: str, strategy: MaintenanceStrategy) -> MaintenanceStrategy:
-    """Met à jour une stratégie de maintenance"""
-    strategy.id = strategy_id
-    result = await get_database().maintenance_strategies.replace_one({"id": strategy_id}, strategy.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Stratégie de maintenance non trouvée")
-    return strategy
-
-async def delete_maintenance_strategy(strategy_id: str) -> bool:
-    """Supprime une stratégie de maintenance"""
-    result = await get_database().maintenance_strategies.delete_one({"id": strategy_id})
-    return result.deleted_count > 0
+maintenance_strategies_crud = CRUDRepository("maintenance_strategies", MaintenanceStrategy, "Stratégie de maintenance non trouvée", cached=True)
+create_maintenance_strategy = maintenance_strategies_crud.create
+get_maintenance_strategy = maintenance_strategies_crud.get
+get_many_maintenance_strategies = maintenance_strategies_crud.get_many
+iter_maintenance_strategies = maintenance_strategies_crud.iter_all
+get_all_maintenance_strategies = maintenance_strategies_crud.get_all
+update_maintenance_strategy = maintenance_strategies_crud.update
+update_many_maintenance_strategies = maintenance_strategies_crud.update_many
+delete_maintenance_strategy = maintenance_strategies_crud.delete
+delete_many_maintenance_strategies = maintenance_strategies_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR CYCLE SET
 # ============================================================================
 
-async def create_cycle_set(cycle_set: CycleSet) -> CycleSet:
-    """Crée un nouvel ensemble de cycles"""
-    cycle_set.id = generate_id()
-    await get_database().cycle_sets.insert_one(cycle_set.dict())
-    return cycle_set
-
-async def get_cycle_set(cycle_set_id: str) -> Optional[CycleSet]:
-    """Récupère un ensemble de cycles par ID"""
-    result = await get_database().cycle_sets.find_one({"id": cycle_set_id})
-    return CycleSet(**result) if result else None
-
-async def get_all_cycle_sets() -> List[CycleSet]:
-    """Récupère tous les ensembles de cycles"""
-    results = await get_database().cycle_sets.find().to_list(length=None)
-    return [CycleSet(**result) for result in results]
-
-async def update_cycle_set(cycle_set_id: str, cycle_set: CycleSet) -> CycleSet:
-    """Met à jour un ensemble de cycles"""
-    cycle_set.id = cycle_set_id
-    result = await get_database().cycle_sets.replace_one({"id": cycle_set_id}, cycle_set.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Ensemble de cycles non trouvé")
-    return cycle_set
-
-async def delete_cycle_set(cycle_set_id: str) -> bool:
-    """Supprime un ensemble de cycles"""
-    result = await get_database().cycle_sets.delete_one({"id": cycle_set_id})
-    return result.deleted_count > 0
+cycle_sets_crud = CRUDRepository("cycle_sets", CycleSet, "Ensemble de cycles non trouvé", cached=True)
+create_cycle_set = cycle_sets_crud.create
+get_cycle_set = cycle_sets_crud.get
+get_many_cycle_sets = cycle_sets_crud.get_many
+iter_cycle_sets = cycle_sets_crud.iter_all
+get_all_cycle_sets = cycle_sets_crud.get_all
+update_cycle_set = cycle_sets_crud.update
+update_many_cycle_sets = cycle_sets_crud.update_many
+delete_cycle_set = cycle_sets_crud.delete
+delete_many_cycle_sets = cycle_sets_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR WORK CENTER HIERARCHY
 # ============================================================================
 
-async def create_work_center_hierarchy(hierarchy: WorkCenterHierarchy) -> WorkCenterHierarchy:
-    """Crée une nouvelle hiérarchie de centre de travail"""
-    hierarchy.id = generate_id()
-    await get_database().work_center_hierarchies.insert_one(hierarchy.dict())
-    return hierarchy
-
-async def get_work_center_hierarchy(hierarchy_id: str) -> Optional[WorkCenterHierarchy]:
-    """Récupère une hiérarchie de centre de travail par ID"""
-    result = await get_database().work_center_hierarchies.find_one({"id": hierarchy_id})
-    return WorkCenterHierarchy(**result) if result else None
-
-async def get_all_work_center_hierarchies() -> List[WorkCenterHierarchy]:
-    """Récupère toutes les hiérarchies de centres de travail"""
-    results = await get_database().work_center_hierarchies.find().to_list(length=None)
-    return [WorkCenterHierarchy(**result) for result in results]
-
-async def update_work_center_hierarchy(hierarchy_id: str, hierarchy: WorkCenterHierarchy) -> WorkCenterHierarchy:
-    """Met à jour une hiérarchie de centre de travail"""
-    hierarchy.id = hierarchy_id
-    result = await get_database().work_center_hierarchies.replace_one({"id": hierarchy_id}, hierarchy.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Hiérarchie de centre de travail non trouvée")
-    return hierarchy
-
-async def delete_work_center_hierarchy(hierarchy_id: str) -> bool:
-    """Supprime une hiérarchie de centre de travail"""
-    result = await get_database().work_center_hierarchies.delete_one({"id": hierarchy_id})
-    return result.deleted_count > 0
+work_center_hierarchies_crud = CRUDRepository("work_center_hierarchies", WorkCenterHierarchy, "Hiérarchie de centre de travail non trouvée", cached=True)
+create_work_center_hierarchy = work_center_hierarchies_crud.create
+get_work_center_hierarchy = work_center_hierarchies_crud.get
+get_many_work_center_hierarchies = work_center_hierarchies_crud.get_many
+iter_work_center_hierarchies = work_center_hierarchies_crud.iter_all
+get_all_work_center_hierarchies = work_center_hierarchies_crud.get_all
+update_work_center_hierarchy = work_center_hierarchies_crud.update
+update_many_work_center_hierarchies = work_center_hierarchies_crud.update_many
+delete_work_center_hierarchy = work_center_hierarchies_crud.delete
+delete_many_work_center_hierarchies = work_center_hierarchies_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR WORK CENTER
 # ============================================================================
 
-async def create_work_center(work_center: WorkCenter) -> WorkCenter:
-    """Crée un nouveau centre de travail"""
-    work_center.id = generate_id()
-    await get_database().work_centers.insert_one(work_center.dict())
-    return work_center
-
-async def get_work_center(work_center_id: str) -> Optional[WorkCenter]:
-    """Récupère un centre de travail par ID"""
-    result = await get_database().work_centers.find_one({"id": work_center_id})
-    return WorkCenter(**result) if result else None
-
-async def get_all_work_centers() -> List[WorkCenter]:
-    """Récupère tous les centres de travail"""
-    results = await get_database().work_centers.find().to_list(length=None)
-    return [WorkCenter(**result) for result in results]
-
-async def update_work_center(work_center_id: str, work_center: WorkCenter) -> WorkCenter:
-    """Met à jour un centre de travail"""
-    work_center.id = work_center_id
-    result = await get_database().work_centers.replace_one({"id": work_center_id}, work_center.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Centre de travail non trouvé")
-    return work_center
-
-async def delete_work_center(work_center_id: str) -> bool:
-    """Supprime un centre de travail"""
-    result = await get_database().work_centers.delete_one({"id": work_center_id})
-    return result.deleted_count > 0
+work_centers_crud = CRUDRepository("work_centers", WorkCenter, "Centre de travail non trouvé")
+create_work_center = work_centers_crud.create
+get_work_center = work_centers_crud.get
+get_many_work_centers = work_centers_crud.get_many
+iter_work_centers = work_centers_crud.iter_all
+get_all_work_centers = work_centers_crud.get_all
+update_work_center = work_centers_crud.update
+update_many_work_centers = work_centers_crud.update_many
+delete_work_center = work_centers_crud.delete
+delete_many_work_centers = work_centers_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR MATERIAL
 # ============================================================================
 
-async def create_material(material: Material) -> Material:
-    """Crée un nouveau matériel"""
-    material.id = generate_id()
-    await get_database().materials.insert_one(material.dict())
-    return material
-
-async def get_material(material_id: str) -> Optional[Material]:
-    """Récupère un matériel par ID"""
-    result = await get_database().materials.find_one({"id": material_id})
-    return Material(**result) if result else None
-
-async def get_all_materials() -> List[Material]:
-    """Récupère tous les matériels"""
-    results = await get_database().materials.find().to_list(length=None)
-    return [Material(**result) for result in results]
-
-async def update_material(material_id: str, material: Material) -> Material:
-    """Met à jour un matériel"""
-    material.id = material_id
-    result = await get_database().materials.replace_one({"id": material_id}, material.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Matériel non trouvé")
-    return material
-
-async def delete_material(material_id: str) -> bool:
-    """Supprime un matériel"""
-    result = await get_database().materials.delete_one({"id": material_id})
-    return result.deleted_count > 0
+materials_crud = CRUDRepository("materials", Material, "Matériel non trouvé")
+create_material = materials_crud.create
+create_many_materials = materials_crud.create_many
+get_material = materials_crud.get
+get_many_materials = materials_crud.get_many
+iter_materials = materials_crud.iter_all
+get_all_materials = materials_crud.get_all
+update_material = materials_crud.update
+update_many_materials = materials_crud.update_many
+delete_material = materials_crud.delete
+delete_many_materials = materials_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR BILL OF MATERIAL
 # ============================================================================
 
-async def create_bill_of_material(bom: BillOfMaterial) -> BillOfMaterial:
-    """Crée une nouvelle nomenclature"""
-    bom.id = generate_id()
-    await get_database().bill_of_materials.insert_one(bom.dict())
-    return bom
-
-async def get_bill_of_material(bom_id: str) -> Optional[BillOfMaterial]:
-    """Récupère une nomenclature par ID"""
-    result = await get_database().bill_of_materials.find_one({"id": bom_id})
-    return BillOfMaterial(**result) if result else None
-
-async def get_all_bill_of_materials() -> List[BillOfMaterial]:
-    """Récupère toutes les nomenclatures"""
-    results = await get_database().bill_of_materials.find().to_list(length=None)
-    return [BillOfMaterial(**result) for result in results]
-
-async def update_bill_of_material(bom_id: str, bom: BillOfMaterial) -> BillOfMaterial:
-    """Met à jour une nomenclature"""
-    bom.id = bom_id
-    result = await get_database().bill_of_materials.replace_one({"id": bom_id}, bom.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Nomenclature non trouvée")
-    return bom
-
-async def delete_bill_of_material(bom_id: str) -> bool:
-    """Supprime une nomenclature"""
-    result = await get_database().bill_of_materials.delete_one({"id": bom_id})
-    return result.deleted_count > 0
+bill_of_materials_crud = CRUDRepository("bill_of_materials", BillOfMaterial, "Nomenclature non trouvée")
+create_bill_of_material = bill_of_materials_crud.create
+get_bill_of_material = bill_of_materials_crud.get
+get_many_bill_of_materials = bill_of_materials_crud.get_many
+iter_bill_of_materials = bill_of_materials_crud.iter_all
+get_all_bill_of_materials = bill_of_materials_crud.get_all
+update_bill_of_material = bill_of_materials_crud.update
+update_many_bill_of_materials = bill_of_materials_crud.update_many
+delete_bill_of_material = bill_of_materials_crud.delete
+delete_many_bill_of_materials = bill_of_materials_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR FUNCTIONAL LOCATION
 # ============================================================================
 
-async def create_functional_location(fl: FunctionalLocation) -> FunctionalLocation:
-    """Crée un nouveau poste technique"""
-    fl.id = generate_id()
-    await get_database().functional_locations.insert_one(fl.dict())
-    return fl
-
-async def get_functional_location(fl_id: str) -> Optional[FunctionalLocation]:
-    """Récupère un poste technique par ID"""
-    result = await get_database().functional_locations.find_one({"id": fl_id})
-    return FunctionalLocation(**result) if result else None
-
-async def get_all_functional_locations() -> List[FunctionalLocation]:
-    """Récupère tous les postes techniques"""
-    results = await get_database().functional_locations.find().to_list(length=None)
-    return [FunctionalLocation(**result) for result in results]
-
-async def update_functional_location(fl_id: str, fl: FunctionalLocation) -> FunctionalLocation:
-    """Met à jour un poste technique"""
-    fl.id = fl_id
-    result = await get_database().functional_locations.replace_one({"id": fl_id}, fl.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Poste technique non trouvé")
-    return fl
-
-async def delete_functional_location(fl_id: str) -> bool:
-    """Supprime un poste technique"""
-    result = await get_database().functional_locations.delete_one({"id": fl_id})
-    return result.deleted_count > 0
+functional_locations_crud = CRUDRepository("functional_locations", FunctionalLocation, "Poste technique non trouvé")
+create_functional_location = functional_locations_crud.create
+upsert_many_functional_locations = functional_locations_crud.upsert_many
+get_functional_location = functional_locations_crud.get
+get_many_functional_locations = functional_locations_crud.get_many
+iter_functional_locations = functional_locations_crud.iter_all
+get_all_functional_locations = functional_locations_crud.get_all
+update_functional_location = functional_locations_crud.update
+update_many_functional_locations = functional_locations_crud.update_many
+delete_functional_location = functional_locations_crud.delete
+delete_many_functional_locations = functional_locations_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR EQUIPMENT
 # ============================================================================
 
-async def create_equipment(equipment: Equipment) -> Equipment:
-    """Crée un nouvel équipement"""
-    equipment.id = generate_id()
-    await get_database().equipment.insert_one(equipment.dict())
-    return equipment
-
-async def get_equipment(equipment_id: str) -> Optional[Equipment]:
-    """Récupère un équipement par ID"""
-    result = await get_database().equipment.find_one({"id": equipment_id})
-    return Equipment(**result) if result else None
-
-async def get_all_equipment() -> List[Equipment]:
-    """Récupère tous les équipements"""
-    results = await get_database().equipment.find().to_list(length=None)
-    return [Equipment(**result) for result in results]
-
-async def update_equipment(equipment_id: str, equipment: Equipment) -> Equipment:
-    """Met à jour un équipement"""
-    equipment.id = equipment_id
-    result = await get_database().equipment.replace_one({"id": equipment_id}, equipment.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Équipement non trouvé")
-    return equipment
-
-async def delete_equipment(equipment_id: str) -> bool:
-    """Supprime un équipement"""
-    result = await get_database().equipment.delete_one({"id": equipment_id})
-    return result.deleted_count > 0
+equipment_crud = CRUDRepository("equipment", Equipment, "Équipement non trouvé", shared_cache=True)
+create_equipment = equipment_crud.create
+create_many_equipment = equipment_crud.create_many
+upsert_many_equipment = equipment_crud.upsert_many
+get_equipment = equipment_crud.get
+get_many_equipment = equipment_crud.get_many
+iter_equipment = equipment_crud.iter_all
+get_all_equipment = equipment_crud.get_all
+update_equipment = equipment_crud.update
+update_many_equipment = equipment_crud.update_many
+delete_equipment = equipment_crud.delete
+delete_many_equipment = equipment_crud.delete_many
+
+async def get_equipment_by_functional_location(functional_location_id: str) -> List[Equipment]:
+    """Récupère les équipements installés sur un poste technique"""
+    return await equipment_crud.find_by({"functional_location_id": functional_location_id})
+
+async def get_equipment_full(equipment_id: str) -> Optional[Dict[str, Any]]:
+    """Récupère un équipement avec ses nomenclatures, points de mesure et gammes en une seule requête"""
+    pipeline = [
+        {"$match": {"_id": equipment_id}},
+        {"$lookup": {"from": "equipment_boms", "localField": "_id", "foreignField": "equipment_id", "as": "boms"}},
+        {"$lookup": {"from": "measuring_points", "localField": "_id", "foreignField": "target_object_id", "as": "measuring_points"}},
+        {"$lookup": {"from": "equipment_task_lists", "localField": "_id", "foreignField": "equipment_id", "as": "task_lists"}},
+    ]
+    async for doc in await equipment_crud.collection.aggregate(pipeline):
+        for related in ("boms", "measuring_points", "task_lists"):
+            for item in doc[related]:
+                from_document(item)
+        return from_document(doc)
+    return None
 
 # ============================================================================
 # CRUD OPERATIONS FOR MEASURING POINT
 # ============================================================================
 
-async def create_measuring_point(mp: MeasuringPoint) -> MeasuringPoint:
-    """Crée un nouveau point de mesure"""
-    mp.id = generate_id()
-    await get_database().measuring_points.insert_one(mp.dict())
-    return mp
-
-async def get_measuring_point(mp_id: str) -> Optional[MeasuringPoint]:
-    """Récupère un point de mesure par ID"""
-    result = await get_database().measuring_points.find_one({"id": mp_id})
-    return MeasuringPoint(**result) if result else None
-
-async def get_all_measuring_points() -> List[MeasuringPoint]:
-    """Récupère tous les points de mesure"""
-    results = await get_database().measuring_points.find().to_list(length=None)
-    return [MeasuringPoint(**result) for result in results]
+measuring_points_crud = CRUDRepository("measuring_points", MeasuringPoint, "Point de mesure non trouvé")
+create_measuring_point = measuring_points_crud.create
+create_many_measuring_points = measuring_points_crud.create_many
+get_measuring_point = measuring_points_crud.get
+get_many_measuring_points = measuring_points_crud.get_many
+iter_measuring_points = measuring_points_crud.iter_all
+get_all_measuring_points = measuring_points_crud.get_all
+update_measuring_point = measuring_points_crud.update
+update_many_measuring_points = measuring_points_crud.update_many
+delete_measuring_point = measuring_points_crud.delete
+delete_many_measuring_points = measuring_points_crud.delete_many
 
-async def update_measuring_point(mp_id: str, mp: MeasuringPoint) -> MeasuringPoint:
-    """Met à jour un point de mesure"""
-    mp.id = mp_id
-    result = await get_database().measuring_points.replace_one({"id": mp_id}, mp.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Point de mesure non trouvé")
-    return mp
-
-async def delete_measuring_point(mp_id: str) -> bool:
-    """Supprime un point de mesure"""
-    result = await get_database().measuring_points.delete_one({"id": mp_id})
-    return result.deleted_count > 0
+async def get_measuring_points_by_object(target_object_id: str) -> List[MeasuringPoint]:
+    """Récupère les points de mesure d'un objet cible"""
+    return await measuring_points_crud.find_by({"target_object_id": target_object_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR COUNTER
 # ============================================================================
 
-async def create_counter(counter: Counter) -> Counter:
-    """Crée un nouveau compteur"""
-    counter.id = generate_id()
-    await get_database().counters.insert_one(counter.dict())
-    return counter
-
-async def get_counter(counter_id: str) -> Optional[Counter]:
-    """Récupère un compteur par ID"""
-    result = await get_database().counters.find_one({"id": counter_id})
-    return Counter(**result) if result else None
-
-async def get_all_counters() -> List[Counter]:
-    """Récupère tous les compteurs"""
-    results = await get_database().counters.find().to_list(length=None)
-    return [Counter(**result) for result in results]
+counters_crud = CRUDRepository("counters", Counter, "Compteur non trouvé")
+create_counter = counters_crud.create
+create_many_counters = counters_crud.create_many
+get_counter = counters_crud.get
+get_many_counters = counters_crud.get_many
+iter_counters = counters_crud.iter_all
+get_all_counters = counters_crud.get_all
+update_counter = counters_crud.update
+update_many_counters = counters_crud.update_many
+delete_counter = counters_crud.delete
+delete_many_counters = counters_crud.delete_many
 
-async def update_counter(counter_id: str, counter: Counter) -> Counter:
-    """Met à jour un compteur"""
-    counter.id = counter_id
-    result = await get_database().counters.replace_one({"id": counter_id}, counter.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Compteur non trouvé")
-    return counter
-
-async def delete_counter(counter_id: str) -> bool:
-    """Supprime un compteur"""
-    result = await get_database().counters.delete_one({"id": counter_id})
-    return result.deleted_count > 0
+async def get_counters_by_object(target_object_id: str) -> List[Counter]:
+    """Récupère les compteurs d'un objet cible"""
+    return await counters_crud.find_by({"target_object_id": target_object_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR SERIAL NUMBER
 # ============================================================================
 
-async def create_serial_number(sn: SerialNumber) -> SerialNumber:
-    """Crée un nouveau numéro de série"""
-    sn.id = generate_id()
-    await get_database().serial_numbers.insert_one(sn.dict())
-    return sn
-
-async def get_serial_number(sn_id: str) -> Optional[SerialNumber]:
-    """Récupère un numéro de série par ID"""
-    result = await get_database().serial_numbers.find_one({"id": sn_id})
-    return SerialNumber(**result) if result else None
-
-async def get_all_serial_numbers() -> List[SerialNumber]:
-    """Récupère tous les numéros de série"""
-    results = await get_database().serial_numbers.find().to_list(length=None)
-    return [SerialNumber(**result) for result in results]
+serial_numbers_crud = CRUDRepository("serial_numbers", SerialNumber, "Numéro de série non trouvé")
+create_serial_number = serial_numbers_crud.create
+create_many_serial_numbers = serial_numbers_crud.create_many
+get_serial_number = serial_numbers_crud.get
+get_many_serial_numbers = serial_numbers_crud.get_many
+iter_serial_numbers = serial_numbers_crud.iter_all
+get_all_serial_numbers = serial_numbers_crud.get_all
+update_serial_number = serial_numbers_crud.update
+update_many_serial_numbers = serial_numbers_crud.update_many
+delete_serial_number = serial_numbers_crud.delete
+delete_many_serial_numbers = serial_numbers_crud.delete_many
 
-async def update_serial_number(sn_id: str, sn: SerialNumber) -> SerialNumber:
-    """Met à jour un numéro de série"""
-    sn.id = sn_id
-    result = await get_database().serial_numbers.replace_one({"id": sn_id}, sn.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Numéro de série non trouvé")
-    return sn
-
-async def delete_serial_number(sn_id: str) -> bool:
-    """Supprime un numéro de série"""
-    result = await get_database().serial_numbers.delete_one({"id": sn_id})
-    return result.deleted_count > 0
+async def get_serial_numbers_by_equipment(equipment_id: str) -> List[SerialNumber]:
+    """Récupère les numéros de série d'un équipement"""
+    return await serial_numbers_crud.find_by({"equipment_id": equipment_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR FUNCTIONAL LOCATION BOM
 # ============================================================================
 
-async def create_functional_location_bom(fl_bom: FunctionalLocationBOM) -> FunctionalLocationBOM:
-    """Crée une nouvelle nomenclature de poste technique"""
-    fl_bom.id = generate_id()
-    await get_database().functional_location_boms.insert_one(fl_bom.dict())
-    return fl_bom
-
-async def get_functional_location_bom(fl_bom_id: str) -> Optional[FunctionalLocationBOM]:
-    """Récupère une nomenclature de poste technique par ID"""
-    result = await get_database().functional_location_boms.find_one({"id": fl_bom_id})
-    return FunctionalLocationBOM(**result) if result else None
-
-async def get_all_functional_location_boms() -> List[FunctionalLocationBOM]:
-    """Récupère toutes les nomenclatures de postes techniques"""
-    results = await get_database().functional_location_boms.find().to_list(length=None)
-    return [FunctionalLocationBOM(**result) for result in results]
+functional_location_boms_crud = CRUDRepository("functional_location_boms", FunctionalLocationBOM, "Nomenclature de poste technique non trouvée")
+create_functional_location_bom = functional_location_boms_crud.create
+get_functional_location_bom = functional_location_boms_crud.get
+get_many_functional_location_boms = functional_location_boms_crud.get_many
+iter_functional_location_boms = functional_location_boms_crud.iter_all
+get_all_functional_location_boms = functional_location_boms_crud.get_all
+update_functional_location_bom = functional_location_boms_crud.update
+update_many_functional_location_boms = functional_location_boms_crud.update_many
+delete_functional_location_bom = functional_location_boms_crud.delete
+delete_many_functional_location_boms = functional_location_boms_crud.delete_many
 
-async def update_functional_location_bom(fl_bom_id: str, fl_bom: FunctionalLocationBOM) -> FunctionalLocationBOM:
-    """Met à jour une nomenclature de poste technique"""
-    fl_bom.id = fl_bom_id
-    result = await get_database().functional_location_boms.replace_one({"id": fl_bom_id}, fl_bom.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Nomenclature de poste technique non trouvée")
-    return fl_bom
-
-async def delete_functional_location_bom(fl_bom_id: str) -> bool:
-    """Supprime une nomenclature de poste technique"""
-    result = await get_database().functional_location_boms.delete_one({"id": fl_bom_id})
-    return result.deleted_count > 0
+async def get_boms_for_functional_location(functional_location_id: str) -> List[FunctionalLocationBOM]:
+    """Récupère les nomenclatures d'un poste technique"""
+    return await functional_location_boms_crud.find_by({"functional_location_id": functional_location_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR EQUIPMENT BOM
 # ============================================================================
 
-async def create_equipment_bom(eq_bom: EquipmentBOM) -> EquipmentBOM:
-    """Crée une nouvelle nomenclature d'équipement"""
-    eq_bom.id = generate_id()
-    await get_database().equipment_boms.insert_one(eq_bom.dict())
-    return eq_bom
-
-async def get_equipment_bom(eq_bom_id: str) -> Optional[EquipmentBOM]:
-    """Récupère une nomenclature d'équipement par ID"""
-    result = await get_database().equipment_boms.find_one({"id": eq_bom_id})
-    return EquipmentBOM(**result) if result else None
+equipment_boms_crud = CRUDRepository("equipment_boms", EquipmentBOM, "Nomenclature d'équipement non trouvée")
+create_equipment_bom = equipment_boms_crud.create
+get_equipment_bom = equipment_boms_crud.get
+get_many_equipment_boms = equipment_boms_crud.get_many
+iter_equipment_boms = equipment_boms_crud.iter_all
+get_all_equipment_boms = equipment_boms_crud.get_all
+update_equipment_bom = equipment_boms_crud.update
+update_many_equipment_boms = equipment_boms_crud.update_many
+delete_equipment_bom = equipment_boms_crud.delete
+delete_many_equipment_boms = equipment_boms_crud.delete_many
 
-async def get_all_equipment_boms() -> List[EquipmentBOM]:
-    """Récupère toutes les nomenclatures d'équipements"""
-    results = await get_database().equipment_boms.find().to_list(length=None)
-    return [EquipmentBOM(**result) for result in results]
-
-async def update_equipment_bom(eq_bom_id: str, eq_bom: EquipmentBOM) -> EquipmentBOM:
-    """Met à jour une nomenclature d'équipement"""
-    eq_bom.id = eq_bom_id
-    result = await get_database().equipment_boms.replace_one({"id": eq_bom_id}, eq_bom.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Nomenclature d'équipement non trouvée")
-    return eq_bom
-
-async def delete_equipment_bom(eq_bom_id: str) -> bool:
-    """Supprime une nomenclature d'équipement"""
-    result = await get_database().equipment_boms.delete_one({"id": eq_bom_id})
-    return result.deleted_count > 0
+async def get_boms_for_equipment(equipment_id: str) -> List[EquipmentBOM]:
+    """Récupère les nomenclatures d'un équipement"""
+    return await equipment_boms_crud.find_by({"equipment_id": equipment_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR GENERAL TASK LIST
 # ============================================================================
 
-async def create_general_task_list(gtl: GeneralTaskList) -> GeneralTaskList:
-    """Crée une nouvelle gamme générale"""
-    gtl.id = generate_id()
-    await get_database().general_task_lists.insert_one(gtl.dict())
-    return gtl
-
-async def get_general_task_list(gtl_id: str) -> Optional[GeneralTaskList]:
-    """Récupère une gamme générale par ID"""
-    result = await get_database().general_task_lists.find_one({"id": gtl_id})
-    return GeneralTaskList(**result) if result else None
-
-async def get_all_general_task_lists() -> List[GeneralTaskList]:
-    """Récupère toutes les gammes générales"""
-    results = await get_database().general_task_lists.find().to_list(length=None)
-    return [GeneralTaskList(**result) for result in results]
-
-async def update_general_task_list(gtl_id: str, gtl: GeneralTaskList) -> GeneralTaskList:
-    """Met à jour une gamme générale"""
-    gtl.id = gtl_id
-    result = await get_database().general_task_lists.replace_one({"id": gtl_id}, gtl.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Gamme générale non trouvée")
-    return gtl
-
-async def delete_general_task_list(gtl_id: str) -> bool:
-    """Supprime une gamme générale"""
-    result = await get_database().general_task_lists.delete_one({"id": gtl_id})
-    return result.deleted_count > 0
+general_task_lists_crud = CRUDRepository("general_task_lists", GeneralTaskList, "Gamme générale non trouvée")
+create_general_task_list = general_task_lists_crud.create
+get_general_task_list = general_task_lists_crud.get
+get_many_general_task_lists = general_task_lists_crud.get_many
+iter_general_task_lists = general_task_lists_crud.iter_all
+get_all_general_task_lists = general_task_lists_crud.get_all
+update_general_task_list = general_task_lists_crud.update
+update_many_general_task_lists = general_task_lists_crud.update_many
+delete_general_task_list = general_task_lists_crud.delete
+delete_many_general_task_lists = general_task_lists_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR EQUIPMENT TASK LIST
 # ============================================================================
 
-async def create_equipment_task_list(etl: EquipmentTaskList) -> EquipmentTaskList:
-    """Crée une nouvelle gamme pour équipement"""
-    etl.id = generate_id()
-    await get_database().equipment_task_lists.insert_one(etl.dict())
-    return etl
+equipment_task_lists_crud = CRUDRepository("equipment_task_lists", EquipmentTaskList, "Gamme pour équipement non trouvée")
+create_equipment_task_list = equipment_task_lists_crud.create
+get_equipment_task_list = equipment_task_lists_crud.get
+get_many_equipment_task_lists = equipment_task_lists_crud.get_many
+iter_equipment_task_lists = equipment_task_lists_crud.iter_all
+get_all_equipment_task_lists = equipment_task_lists_crud.get_all
+update_equipment_task_list = equipment_task_lists_crud.update
+update_many_equipment_task_lists = equipment_task_lists_crud.update_many
+delete_equipment_task_list = equipment_task_lists_crud.delete
+delete_many_equipment_task_lists = equipment_task_lists_crud.delete_many
 
-async def get_equipment_task_list(etl_id: str) -> Optional[EquipmentTaskList]:
-    """Récupère une gamme pour équipement par ID"""
-    result = await get_database().equipment_task_lists.find_one({"id": etl_id})
-    return EquipmentTaskList(**result) if result else None
-
-async def get_all_equipment_task_lists() -> List[EquipmentTaskList]:
-    """Récupère toutes les gammes pour équipements"""
-    results = await get_database().equipment_task_lists.find().to_list(length=None)
-    return [EquipmentTaskList(**result) for result in results]
-
-async def update_equipment_task_list(etl_id: str, etl: EquipmentTaskList) -> EquipmentTaskList:
-    """Met à jour une gamme pour équipement"""
-    etl.id = etl_id
-    result = await get_database().equipment_task_lists.replace_one({"id": etl_id}, etl.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Gamme pour équipement non trouvée")
-    return etl
-
-async def delete_equipment_task_list(etl_id: str) -> bool:
-    """Supprime une gamme pour équipement"""
-    result = await get_database().equipment_task_lists.delete_one({"id": etl_id})
-    return result.deleted_count > 0
+async def get_task_lists_for_equipment(equipment_id: str) -> List[EquipmentTaskList]:
+    """Récupère les gammes d'un équipement"""
+    return await equipment_task_lists_crud.find_by({"equipment_id": equipment_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR FUNCTIONAL LOCATION TASK LIST
 # ============================================================================
 
-async def create_functional_location_task_list(fltl: FunctionalLocationTaskList) -> FunctionalLocationTaskList:
-    """Crée une nouvelle gamme pour poste technique"""
-    fltl.id = generate_id()
-    await get_database().functional_location_task_lists.insert_one(fltl.dict())
-    return fltl
-
-async def get_functional_location_task_list(fltl_id: str) -> Optional[FunctionalLocationTaskList]:
-    """Récupère une gamme pour poste technique par ID"""
-    result = await get_database().functional_location_task_lists.find_one({"id": fltl_id})
-    return FunctionalLocationTaskList(**result) if result else None
-
-async def get_all_functional_location_task_lists() -> List[FunctionalLocationTaskList]:
-    """Récupère toutes les gammes pour postes techniques"""
-    results = await get_database().functional_location_task_lists.find().to_list(length=None)
-    return [FunctionalLocationTaskList(**result) for result in results]
+functional_location_task_lists_crud = CRUDRepository("functional_location_task_lists", FunctionalLocationTaskList, "Gamme pour poste technique non trouvée")
+create_functional_location_task_list = functional_location_task_lists_crud.create
+create_many_functional_location_task_lists = functional_location_task_lists_crud.create_many
+get_functional_location_task_list = functional_location_task_lists_crud.get
+get_many_functional_location_task_lists = functional_location_task_lists_crud.get_many
+iter_functional_location_task_lists = functional_location_task_lists_crud.iter_all
+get_all_functional_location_task_lists = functional_location_task_lists_crud.get_all
+update_functional_location_task_list = functional_location_task_lists_crud.update
+update_many_functional_location_task_lists = functional_location_task_lists_crud.update_many
+delete_functional_location_task_list = functional_location_task_lists_crud.delete
+delete_many_functional_location_task_lists = functional_location_task_lists_crud.delete_many
 
-async def update_functional_location_task_list(fltl_id: str, fltl: FunctionalLocationTaskList) -> FunctionalLocationTaskList:
-    """Met à jour une gamme pour poste technique"""
-    fltl.id = fltl_id
-    result = await get_database().functional_location_task_lists.replace_one({"id": fltl_id}, fltl.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Gamme pour poste technique non trouvée")
-    return fltl
-
-async def delete_functional_location_task_list(fltl_id: str) -> bool:
-    """Supprime une gamme pour poste technique"""
-    result = await get_database().functional_location_task_lists.delete_one({"id": fltl_id})
-    return result.deleted_count > 0
+async def get_task_lists_for_functional_location(functional_location_id: str) -> List[FunctionalLocationTaskList]:
+    """Récupère les gammes d'un poste technique"""
+    return await functional_location_task_lists_crud.find_by({"functional_location_id": functional_location_id})
 
 # ============================================================================
 # CRUD OPERATIONS FOR SINGLE CYCLE PLAN
 # ============================================================================
 
-async def create_single_cycle_plan(scp: SingleCyclePlan) -> SingleCyclePlan:
-    """Crée un nouveau plan à cycle simple"""
-    scp.id = generate_id()
-    await get_database().single_cycle_plans.insert_one(scp.dict())
-    return scp
-
-async def get_single_cycle_plan(scp_id: str) -> Optional[SingleCyclePlan]:
-    """Récupère un plan à cycle simple par ID"""
-    result = await get_database().single_cycle_plans.find_one({"id": scp_id})
-    return SingleCyclePlan(**result) if result else None
-
-async def get_all_single_cycle_plans() -> List[SingleCyclePlan]:
-    """Récupère tous les plans à cycle simple"""
-    results = await get_database().single_cycle_plans.find().to_list(length=None)
-    return [SingleCyclePlan(**result) for result in results]
-
-async def update_single_cycle_plan(scp_id: str, scp: SingleCyclePlan) -> SingleCyclePlan:
-    """Met à jour un plan à cycle simple"""
-    scp.id = scp_id
-    result = await get_database().single_cycle_plans.replace_one({"id": scp_id}, scp.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Plan à cycle simple non trouvé")
-    return scp
-
-async def delete_single_cycle_plan(scp_id: str) -> bool:
-    """Supprime un plan à cycle simple"""
-    result = await get_database().single_cycle_plans.delete_one({"id": scp_id})
-    return result.deleted_count > 0
+single_cycle_plans_crud = CRUDRepository("single_cycle_plans", SingleCyclePlan, "Plan à cycle simple non trouvé", shared_cache=True)
+create_single_cycle_plan = single_cycle_plans_crud.create
+create_many_single_cycle_plans = single_cycle_plans_crud.create_many
+get_single_cycle_plan = single_cycle_plans_crud.get
+get_many_single_cycle_plans = single_cycle_plans_crud.get_many
+iter_single_cycle_plans = single_cycle_plans_crud.iter_all
+get_all_single_cycle_plans = single_cycle_plans_crud.get_all
+update_single_cycle_plan = single_cycle_plans_crud.update
+update_many_single_cycle_plans = single_cycle_plans_crud.update_many
+delete_single_cycle_plan = single_cycle_plans_crud.delete
+delete_many_single_cycle_plans = single_cycle_plans_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR STRATEGY MAINTENANCE PLAN
 # ============================================================================
 
-async def create_strategy_maintenance_plan(smp: StrategyMaintenancePlan) -> StrategyMaintenancePlan:
-    """Crée un nouveau plan de maintenance stratégique"""
-    smp.id = generate_id()
-    await get_database().strategy_maintenance_plans.insert_one(smp.dict())
-    return smp
-
-async def get_strategy_maintenance_plan(smp_id: str) -> Optional[StrategyMaintenancePlan]:
-    """Récupère un plan de maintenance stratégique par ID"""
-    result = await get_database().strategy_maintenance_plans.find_one({"id": smp_id})
-    return StrategyMaintenancePlan(**result) if result else None
-
-async def get_all_strategy_maintenance_plans() -> List[StrategyMaintenancePlan]:
-    """Récupère tous les plans de maintenance stratégique"""
-    results = await get_database().strategy_maintenance_plans.find().to_list(length=None)
-    return [StrategyMaintenancePlan(**result) for result in results]
-
-async def update_strategy_maintenance_plan(smp_id: str, smp: StrategyMaintenancePlan) -> StrategyMaintenancePlan:
-    """Met à jour un plan de maintenance stratégique"""
-    smp.id = smp_id
-    result = await get_database().strategy_maintenance_plans.replace_one({"id": smp_id}, smp.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Plan de maintenance stratégique non trouvé")
-    return smp
-
-async def delete_strategy_maintenance_plan(smp_id: str) -> bool:
-    """Supprime un plan de maintenance stratégique"""
-    result = await get_database().strategy_maintenance_plans.delete_one({"id": smp_id})
-    return result.deleted_count > 0
+strategy_maintenance_plans_crud = CRUDRepository("strategy_maintenance_plans", StrategyMaintenancePlan, "Plan de maintenance stratégique non trouvé")
+create_strategy_maintenance_plan = strategy_maintenance_plans_crud.create
+create_many_strategy_maintenance_plans = strategy_maintenance_plans_crud.create_many
+get_strategy_maintenance_plan = strategy_maintenance_plans_crud.get
+get_many_strategy_maintenance_plans = strategy_maintenance_plans_crud.get_many
+iter_strategy_maintenance_plans = strategy_maintenance_plans_crud.iter_all
+get_all_strategy_maintenance_plans = strategy_maintenance_plans_crud.get_all
+update_strategy_maintenance_plan = strategy_maintenance_plans_crud.update
+update_many_strategy_maintenance_plans = strategy_maintenance_plans_crud.update_many
+delete_strategy_maintenance_plan = strategy_maintenance_plans_crud.delete
+delete_many_strategy_maintenance_plans = strategy_maintenance_plans_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR MULTIPLE COUNTER PLAN
 # ============================================================================
 
-async def create_multiple_counter_plan(mcp: MultipleCounterPlan) -> MultipleCounterPlan:
-    """Crée un nouveau plan à plusieurs compteurs"""
-    mcp.id = generate_id()
-    await get_database().multiple_counter_plans.insert_one(mcp.dict())
-    return mcp
-
-async def get_multiple_counter_plan(mcp_id: str) -> Optional[MultipleCounterPlan]:
-    """Récupère un plan à plusieurs compteurs par ID"""
-    result = await get_database().multiple_counter_plans.find_one({"id": mcp_id})
-    return MultipleCounterPlan(**result) if result else None
-
-async def get_all_multiple_counter_plans() -> List[MultipleCounterPlan]:
-    """Récupère tous les plans à plusieurs compteurs"""
-    results = await get_database().multiple_counter_plans.find().to_list(length=None)
-    return [MultipleCounterPlan(**result) for result in results]
-
-async def update_multiple_counter_plan(mcp_id: str, mcp: MultipleCounterPlan) -> MultipleCounterPlan:
-    """Met à jour un plan à plusieurs compteurs"""
-    mcp.id = mcp_id
-    result = await get_database().multiple_counter_plans.replace_one({"id": mcp_id}, mcp.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Plan à plusieurs compteurs non trouvé")
-    return mcp
-
-async def delete_multiple_counter_plan(mcp_id: str) -> bool:
-    """Supprime un plan à plusieurs compteurs"""
-    result = await get_database().multiple_counter_plans.delete_one({"id": mcp_id})
-    return result.deleted_count > 0
+multiple_counter_plans_crud = CRUDRepository("multiple_counter_plans", MultipleCounterPlan, "Plan à plusieurs compteurs non trouvé")
+create_multiple_counter_plan = multiple_counter_plans_crud.create
+create_many_multiple_counter_plans = multiple_counter_plans_crud.create_many
+get_multiple_counter_plan = multiple_counter_plans_crud.get
+get_many_multiple_counter_plans = multiple_counter_plans_crud.get_many
+iter_multiple_counter_plans = multiple_counter_plans_crud.iter_all
+get_all_multiple_counter_plans = multiple_counter_plans_crud.get_all
+update_multiple_counter_plan = multiple_counter_plans_crud.update
+update_many_multiple_counter_plans = multiple_counter_plans_crud.update_many
+delete_multiple_counter_plan = multiple_counter_plans_crud.delete
+delete_many_multiple_counter_plans = multiple_counter_plans_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR CHARACTERISTIC VALUES
 # ============================================================================
 
-async def create_characteristic_values(cv: CharacteristicValues) -> CharacteristicValues:
-    """Crée une nouvelle valeur caractéristique"""
-    cv.id = generate_id()
-    await get_database().characteristic_values.insert_one(cv.dict())
-    return cv
-
-async def get_characteristic_values(cv_id: str) -> Optional[CharacteristicValues]:
-    """Récupère une valeur caractéristique par ID"""
-    result = await get_database().characteristic_values.find_one({"id": cv_id})
-    return CharacteristicValues(**result) if result else None
-
-async def get_all_characteristic_values() -> List[CharacteristicValues]:
-    """Récupère toutes les valeurs caractéristiques"""
-    results = await get_database().characteristic_values.find().to_list(length=None)
-    return [CharacteristicValues(**result) for result in results]
-
-async def update_characteristic_values(cv_id: str, cv: CharacteristicValues) -> CharacteristicValues:
-    """Met à jour une valeur caractéristique"""
-    cv.id = cv_id
-    result = await get_database().characteristic_values.replace_one({"id": cv_id}, cv.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Valeur caractéristique non trouvée")
-    return cv
-
-async def delete_characteristic_values(cv_id: str) -> bool:
-    """Supprime une valeur caractéristique"""
-    result = await get_database().characteristic_values.delete_one({"id": cv_id})
-    return result.deleted_count > 0
+characteristic_values_crud = CRUDRepository("characteristic_values", CharacteristicValues, "Valeur caractéristique non trouvée")
+create_characteristic_values = characteristic_values_crud.create
+create_many_characteristic_values = characteristic_values_crud.create_many
+get_characteristic_values = characteristic_values_crud.get
+get_many_characteristic_values = characteristic_values_crud.get_many
+iter_characteristic_values = characteristic_values_crud.iter_all
+get_all_characteristic_values = characteristic_values_crud.get_all
+update_characteristic_values = characteristic_values_crud.update
+update_many_characteristic_values = characteristic_values_crud.update_many
+delete_characteristic_values = characteristic_values_crud.delete
+delete_many_characteristic_values = characteristic_values_crud.delete_many
 
 # ============================================================================
 # CRUD OPERATIONS FOR NOTIFICATIONS
 # ============================================================================
 
-async def create_notification(notification: Notification) -> Notification:
-    """Crée une nouvelle notification"""
-    if not notification.id:
-        notification.id = generate_id()
-    await get_database().notifications.insert_one(notification.dict())
-    return notification
-
-async def get_notification(notification_id: str) -> Optional[Notification]:
-    """Récupère une notification par ID"""
-    result = await get_database().notifications.find_one({"id": notification_id})
-    return Notification(**result) if result else None
-
-async def get_all_notifications() -> List[Notification]:
-    """Récupère toutes les notifications"""
-    results = await get_database().notifications.find().to_list(length=None)
-    return [Notification(**result) for result in results]
-
-async def update_notification(notification_id: str, notification: Notification) -> Notification:
-    """Met à jour une notification"""
-    notification.id = notification_id
-    result = await get_database().notifications.replace_one({"id": notification_id}, notification.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Notification non trouvée")
-    return notification
-
-async def delete_notification(notification_id: str) -> bool:
-    """Supprime une notification"""
-    result = await get_database().notifications.delete_one({"id": notification_id})
-    return result.deleted_count > 0
-
-async def get_notifications_by_equipment(equipment_id: str) -> List[Notification]:
+notifications_crud = CRUDRepository("notifications", Notification, "Notification non trouvée", shared_cache=True, keep_ids=True)
+create_notification = notifications_crud.create
+create_many_notifications = notifications_crud.create_many
+get_notification = notifications_crud.get
+get_many_notifications = notifications_crud.get_many
+iter_notifications = notifications_crud.iter_all
+get_all_notifications = notifications_crud.get_all
+update_notification = notifications_crud.update
+update_many_notifications = notifications_crud.update_many
+delete_notification = notifications_crud.delete
+delete_many_notifications = notifications_crud.delete_many
+
+async def patch_notification(notification_id: str, changes: NotificationUpdate) -> Notification:
+    """Met à jour uniquement les champs fournis d'une notification"""
+    return await notifications_crud.patch(notification_id, changes.model_dump(exclude_unset=True))
+
+async def get_notifications_filtered(equipment_ids: Optional[List[str]] = None, statuses: Optional[List[str]] = None, priorities: Optional[List[str]] = None, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> List[Notification]:
+    """Récupère les notifications correspondant à plusieurs équipements, statuts et priorités en une seule requête"""
+    query: Dict[str, Any] = {}
+    for field, values in (("equipment_id", equipment_ids), ("status", statuses), ("priority", priorities)):
+        if values:
+            query[field] = {"$in": values}
+    return await notifications_crud.find_by(query, skip, limit)
+
+async def get_notification_stats() -> Dict[str, Dict[str, int]]:
+    """Compte les notifications par statut, priorité et type, calculé côté serveur en une seule agrégation"""
+    pipeline = [{"$facet": {
+        "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+        "by_priority": [{"$group": {"_id": "$priority", "count": {"$sum": 1}}}],
+        "by_type": [{"$group": {"_id": "$notification_type", "count": {"$sum": 1}}}],
+    }}]
+    async for facets in await notifications_crud.collection.aggregate(pipeline):
+        return {name: {group["_id"]: group["count"] for group in groups} for name, groups in facets.items()}
+    return {}
+
+async def get_notifications_by_equipment(equipment_id: str, skip: int = 0, limit: int = 0) -> List[Notification]:
     """Récupère toutes les notifications pour un équipement"""
-    results = await get_database().notifications.find({"equipment_id": equipment_id}).to_list(length=None)
-    return [Notification(**result) for result in results]
+    return await notifications_crud.find_by({"equipment_id": equipment_id}, skip, limit)
 
-async def get_notifications_by_status(status: str) -> List[Notification]:
+async def get_notifications_by_status(status: str, skip: int = 0, limit: int = 0) -> List[Notification]:
     """Récupère toutes les notifications par statut"""
-    results = await get_database().notifications.find({"status": status}).to_list(length=None)
-    return [Notification(**result) for result in results]
+    return await notifications_crud.find_by({"status": status}, skip, limit)
 
-async def get_notifications_by_priority(priority: str) -> List[Notification]:
+async def get_notifications_by_priority(priority: str, skip: int = 0, limit: int = 0) -> List[Notification]:
     """Récupère toutes les notifications par priorité"""
-    results = await get_database().notifications.find({"priority": priority}).to_list(length=None)
-    return [Notification(**result) for result in results]
+    return await notifications_crud.find_by({"priority": priority}, skip, limit)
 
 # ============================================================================
 # CRUD OPERATIONS FOR ORDERS
 # ============================================================================
 
-async def create_order(order: Order) -> Order:
-    """Crée un nouvel ordre"""
-    if not order.id:
-        order.id = generate_id()
-    await get_database().orders.insert_one(order.dict())
-    return order
-
-async def get_order(order_id: str) -> Optional[Order]:
-    """Récupère un ordre par ID"""
-    result = await get_database().orders.find_one({"id": order_id})
-    return Order(**result) if result else None
-
-async def get_all_orders() -> List[Order]:
-    """Récupère tous les ordres"""
-    results = await get_database().orders.find().to_list(length=None)
-    return [Order(**result) for result in results]
-
-async def update_order(order_id: str, order: Order) -> Order:
-    """Met à jour un ordre"""
-    order.id = order_id
-    result = await get_database().orders.replace_one({"id": order_id}, order.dict())
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Ordre non trouvé")
-    return order
-
-async def delete_order(order_id: str) -> bool:
-    """Supprime un ordre"""
-    result = await get_database().orders.delete_one({"id": order_id})
-    return result.deleted_count > 0
-
-async def get_orders_by_equipment(equipment_id: str) -> List[Order]:
+orders_crud = CRUDRepository("orders", Order, "Ordre non trouvé", shared_cache=True, keep_ids=True)
+create_order = orders_crud.create
+create_many_orders = orders_crud.create_many
+get_order = orders_crud.get
+get_many_orders = orders_crud.get_many
+iter_orders = orders_crud.iter_all
+get_all_orders = orders_crud.get_all
+update_order = orders_crud.update
+update_many_orders = orders_crud.update_many
+delete_order = orders_crud.delete
+delete_many_orders = orders_crud.delete_many
+
+async def get_orders_by_ids(order_ids: List[str]) -> Dict[str, Order]:
+    """Récupère plusieurs ordres en une seule requête `$in`, indexés par ID
+
+    `get_order` est réservé aux accès unitaires: tout appelant qui résout plusieurs ordres
+    passe par cette fonction plutôt que par une boucle d'appels.
+    """
+    return {order.id: order for order in await get_many_orders(order_ids)}
+
+async def patch_order(order_id: str, changes: OrderUpdate) -> Order:
+    """Met à jour uniquement les champs fournis d'un ordre"""
+    return await orders_crud.patch(order_id, changes.model_dump(exclude_unset=True))
+
+async def get_orders_filtered(equipment_ids: Optional[List[str]] = None, statuses: Optional[List[str]] = None, order_types: Optional[List[str]] = None, work_center_ids: Optional[List[str]] = None, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> List[Order]:
+    """Récupère les ordres correspondant à plusieurs équipements, statuts, types et centres de travail en une seule requête"""
+    query: Dict[str, Any] = {}
+    for field, values in (("equipment_id", equipment_ids), ("status", statuses), ("order_type", order_types), ("work_center_id", work_center_ids)):
+        if values:
+            query[field] = {"$in": values}
+    return await orders_crud.find_by(query, skip, limit)
+
+async def get_order_stats() -> Dict[str, Dict[str, int]]:
+    """Compte les ordres par statut, type et priorité, calculé côté serveur en une seule agrégation"""
+    pipeline = [{"$facet": {
+        "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+        "by_type": [{"$group": {"_id": "$order_type", "count": {"$sum": 1}}}],
+        "by_priority": [{"$group": {"_id": "$priority", "count": {"$sum": 1}}}],
+    }}]
+    async for facets in await orders_crud.collection.aggregate(pipeline):
+        return {name: {group["_id"]: group["count"] for group in groups} for name, groups in facets.items()}
+    return {}
+
+async def get_orders_by_equipment(equipment_id: str, skip: int = 0, limit: int = 0) -> List[Order]:
     """Récupère tous les ordres pour un équipement"""
-    results = await get_database().orders.find({"equipment_id": equipment_id}).to_list(length=None)
-    return [Order(**result) for result in results]
+    return await orders_crud.find_by({"equipment_id": equipment_id}, skip, limit)
+
+async def get_orders_for_equipments(equipment_ids: List[str]) -> Dict[str, List[Order]]:
+    """Récupère les ordres de plusieurs équipements en une seule requête `$in`, groupés par équipement
+
+    À utiliser dès qu'un traitement porte sur plusieurs équipements, plutôt qu'une boucle
+    d'appels à `get_orders_by_equipment`.
+    """
+    grouped: Dict[str, List[Order]] = {equipment_id: [] for equipment_id in equipment_ids}
+    for order in await orders_crud.find_by({"equipment_id": {"$in": equipment_ids}}):
+        grouped[order.equipment_id].append(order)
+    return grouped
 
-async def get_orders_by_status(status: str) -> List[Order]:
+async def get_orders_by_status(status: str, skip: int = 0, limit: int = 0) -> List[Order]:
     """Récupère tous les ordres par statut"""
-    results = await get_database().orders.find({"status": status}).to_list(length=None)
-    return [Order(**result) for result in results]
+    return await orders_crud.find_by({"status": status}, skip, limit)
+
+# Champs servis directement par l'index (status, _id, equipment_id)
+ORDER_SUMMARY_PROJECTION = {"_id": 1, "status": 1, "equipment_id": 1}
+
+async def get_order_summaries_by_status(status: str, skip: int = 0, limit: int = 0) -> List[Dict[str, Any]]:
+    """Récupère l'ID, le statut et l'équipement des ordres d'un statut sans lire les documents"""
+    cursor = orders_crud.collection.find({"status": status}, ORDER_SUMMARY_PROJECTION).sort("_id", 1).skip(skip).limit(limit)
+    return [from_document(doc) async for doc in cursor]
 
-async def get_orders_by_type(order_type: str) -> List[Order]:
+async def get_orders_by_type(order_type: str, skip: int = 0, limit: int = 0) -> List[Order]:
     """Récupère tous les ordres par type"""
-    results = await get_database().orders.find({"order_type": order_type}).to_list(length=None)
-    return [Order(**result) for result in results]
+    return await orders_crud.find_by({"order_type": order_type}, skip, limit)
 
-async def get_orders_by_work_center(work_center_id: str) -> List[Order]:
+async def get_orders_by_work_center(work_center_id: str, skip: int = 0, limit: int = 0) -> List[Order]:
     """Récupère tous les ordres pour un centre de travail"""
-    results = await get_database().orders.find({"work_center_id": work_center_id}).to_list(length=None)
-    return [Order(**result) for result in results] 
+    return await orders_crud.find_by({"work_center_id": work_center_id}, skip, limit)
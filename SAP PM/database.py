@@ -3,11 +3,17 @@ Module de base de données MongoDB pour le simulateur SAP PM
 Contient la configuration MongoDB et les fonctions de gestion
 """
 
-from typing import Dict, List, Any, Optional
-import uuid
+from typing import AsyncIterator, Dict, List, Any, Optional
+import asyncio
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import AsyncMongoClient, IndexModel, WriteConcern
+from pymongo.errors import BulkWriteError
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.collection import AsyncCollection
+from redis.asyncio import Redis
+from pydantic import BaseModel, TypeAdapter
 from schemas import *
 from dotenv import load_dotenv
 
@@ -18,15 +24,89 @@ load_dotenv()
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "RAGENNT4SAP")
 
+# Pool de connexions: connexions maintenues chaudes et plafond partagé par les requêtes
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_POOL", "50"))
+MONGO_MIN_POOL_SIZE = 5
+MONGO_MAX_IDLE_TIME_MS = 60_000
+MONGO_WAIT_QUEUE_TIMEOUT_MS = 2000
+MONGO_SERVER_SELECTION_TIMEOUT_MS = 2000
+# Compression du protocole: zlib est toujours disponible, zstd/snappy demandent leur paquet Python
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zlib")
+
+# Chargement des données d'exemple au démarrage (SEED_DATA=0 pour le désactiver hors développement)
+SEED_DATA = os.getenv("SEED_DATA", "1") == "1"
+
+# Écritures groupées: nombre maximal de documents par insert_many (reste sous la limite BSON de 16 Mo)
+INSERT_BATCH_SIZE = 1000
+
+# Cache partagé Redis (optionnel): activé uniquement si REDIS_URL est défini
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Collections gérées par le simulateur (une par entité SAP PM)
+COLLECTIONS = [
+    "catalogs",
+    "permits",
+    "characteristics",
+    "classes",
+    "maintenance_strategies",
+    "cycle_sets",
+    "work_center_hierarchies",
+    "work_centers",
+    "materials",
+    "bill_of_materials",
+    "functional_locations",
+    "equipment",
+    "measuring_points",
+    "counters",
+    "serial_numbers",
+    "functional_location_boms",
+    "equipment_boms",
+    "general_task_lists",
+    "equipment_task_lists",
+    "functional_location_task_lists",
+    "single_cycle_plans",
+    "strategy_maintenance_plans",
+    "multiple_counter_plans",
+    "characteristic_values",
+    "notifications",
+    "orders",
+]
+
+# Write concern allégé pour les collections à fort volume et faible criticité: acquittement du primaire
+# seul, sans attendre le journal. Une écriture acquittée peut être perdue si le primaire tombe avant
+# la réplication; les données de référence et les plans gardent le write concern par défaut.
+COLLECTION_WRITE_CONCERNS: Dict[str, WriteConcern] = {
+    "notifications": WriteConcern(w=1, j=False),
+}
+
 # Client MongoDB
-client: Optional[AsyncIOMotorClient] = None
+client: Optional[AsyncMongoClient] = None
 database = None
+# Poignées de collections résolues une seule fois à la connexion
+collections: Dict[str, AsyncCollection] = {}
+# Client Redis (None si le cache partagé est désactivé)
+redis_client: Optional[Redis] = None
 
 async def connect_to_mongo():
     """Établit la connexion à MongoDB"""
     global client, database
-    client = AsyncIOMotorClient(MONGO_URL)
+    # Un seul client (et donc un seul pool) par processus
+    if client is not None:
+        return
+    client = AsyncMongoClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        compressors=MONGO_COMPRESSORS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        retryWrites=True,
+    )
     database = client[DATABASE_NAME]
+    # Ping initial: échoue tôt si le serveur est injoignable et amorce le pool
+    await client.admin.command("ping")
+    collections.update({name: database.get_collection(name, write_concern=COLLECTION_WRITE_CONCERNS.get(name)) for name in COLLECTIONS})
     print(f"Connecté à MongoDB: {MONGO_URL}")
     print(f"Base de données: {DATABASE_NAME}")
 
@@ -34,12 +114,121 @@ async def close_mongo_connection():
     """Ferme la connexion à MongoDB"""
     global client
     if client:
-        client.close()
+        await client.close()
+        client = None
         print("Connexion MongoDB fermée")
 
+async def connect_to_redis():
+    """Établit la connexion au cache Redis si REDIS_URL est configuré"""
+    global redis_client
+    if not REDIS_URL:
+        return
+    redis_client = Redis.from_url(REDIS_URL)
+    await redis_client.ping()
+    print(f"Connecté à Redis: {REDIS_URL}")
+
+async def close_redis_connection():
+    """Ferme la connexion au cache Redis"""
+    global redis_client
+    if redis_client:
+        await redis_client.aclose()
+        redis_client = None
+        print("Connexion Redis fermée")
+
+def get_redis() -> Optional[Redis]:
+    """Retourne le client Redis, ou None si le cache partagé est désactivé"""
+    return redis_client
+
+# Index secondaires par collection: champs de rattachement (objet parent) les plus sélectifs en tête
+INDEXES: Dict[str, List[List[tuple]]] = {
+    "equipment": [[("functional_location_id", 1)]],
+    "measuring_points": [[("target_object_id", 1), ("characteristic_id", 1)]],
+    "counters": [[("target_object_id", 1), ("characteristic_id", 1)]],
+    "serial_numbers": [[("equipment_id", 1)], [("material_id", 1)]],
+    "functional_location_boms": [[("functional_location_id", 1), ("material_master_id", 1)]],
+    "equipment_boms": [[("equipment_id", 1), ("material_master_id", 1)]],
+    "equipment_task_lists": [[("equipment_id", 1)]],
+    "functional_location_task_lists": [[("functional_location_id", 1)]],
+    # Les recherches paginées sont triées par `_id`: les index (champ, _id) servent filtre et tri
+    "notifications": [[("equipment_id", 1), ("status", 1), ("priority", 1)], [("equipment_id", 1), ("_id", 1)], [("status", 1), ("_id", 1)], [("priority", 1), ("_id", 1)]],
+    # (status, _id, equipment_id) couvre aussi les recherches par statut seul et sert
+    # entièrement les résumés par statut depuis l'index (requête couverte)
+    "orders": [[("equipment_id", 1), ("_id", 1)], [("status", 1), ("_id", 1), ("equipment_id", 1)], [("order_type", 1), ("_id", 1)], [("work_center_id", 1), ("_id", 1)]],
+}
+
+async def ensure_indexes():
+    """Crée les index secondaires de toutes les collections en parallèle (idempotent)
+
+    Appelée après le chargement des données d'exemple: sur une base neuve, chaque index est
+    construit en une passe sur les documents insérés au lieu d'être maintenu à chaque insertion.
+    """
+    await asyncio.gather(*(
+        get_collection(name).create_indexes([IndexModel(keys) for keys in INDEXES[name]])
+        for name in COLLECTIONS if name in INDEXES
+    ))
+
+# Index de migration: sparse (seuls les documents hérités y figurent) et non unique (l'ancien et le
+# nouveau document peuvent coexister un instant), créé le temps de retrouver les documents à réécrire
+LEGACY_ID_INDEX = "legacy_id"
+
+async def migrate_legacy_collection(name: str):
+    """Réécrit les documents hérités d'une collection (champ `id` distinct de `_id`) avec `_id = id`
+
+    Les documents hérités sont détectés directement (champ `id` présent): une base antérieure
+    sans index sur `id` est migrée elle aussi, et une collection déjà migrée ne coûte qu'une
+    lecture. Chaque réécriture est idempotente: une reprise après interruption termine le
+    travail sans doublon.
+    """
+    collection = get_collection(name)
+    if await collection.find_one({"id": {"$exists": True}}, {"_id": 1}) is None:
+        return
+    await collection.create_index([("id", 1)], name=LEGACY_ID_INDEX, sparse=True)
+    if "id_1" in await collection.index_information():
+        await collection.drop_index("id_1")
+    async for doc in collection.find({"id": {"$exists": True}}).hint(LEGACY_ID_INDEX):
+        legacy_id = doc.pop("_id")
+        doc["_id"] = doc.pop("id")
+        await collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+        await collection.delete_one({"_id": legacy_id})
+    await collection.drop_index(LEGACY_ID_INDEX)
+
+async def migrate_legacy_ids():
+    """Migre les documents hérités de toutes les collections en parallèle"""
+    await asyncio.gather(*(migrate_legacy_collection(name) for name in COLLECTIONS))
+
+def to_document(model: BaseModel) -> Dict[str, Any]:
+    """Convertit un modèle en document MongoDB, l'identifiant servant de clé primaire `_id`"""
+    doc = model.model_dump(exclude_none=True)
+    doc["_id"] = doc.pop("id")
+    return doc
+
+# Adaptateurs List[Modèle] mis en cache: une liste entière est sérialisée en un seul appel pydantic-core
+_list_adapters: Dict[type, TypeAdapter] = {}
+
+def list_adapter(model: type) -> TypeAdapter:
+    """Retourne (et mémorise) l'adaptateur List[Modèle] d'un type de modèle"""
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter
+
+def to_documents(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    """Convertit une liste de modèles du même type en documents MongoDB"""
+    if not models:
+        return []
+    docs = list_adapter(type(models[0])).dump_python(models, exclude_none=True)
+    for doc in docs:
+        doc["_id"] = doc.pop("id")
+    return docs
+
+def from_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Convertit un document MongoDB en données de modèle (`_id` redevient `id`)"""
+    doc["id"] = doc.pop("_id")
+    return doc
+
 def generate_id() -> str:
-    """Génère un ID unique pour les nouvelles entrées"""
-    return str(uuid.uuid4())
+    """Génère un ID unique pour les nouvelles entrées (ObjectId hexadécimal, croissant dans le temps)"""
+    return str(ObjectId())
 
 def get_database():
     """Retourne la connexion à la base de données"""
@@ -48,11 +237,46 @@ def get_database():
         raise RuntimeError("Database connection not established. Please ensure the application has started properly.")
     return database
 
+def get_collection(name: str) -> AsyncCollection:
+    """Retourne la poignée mise en cache d'une collection"""
+    try:
+        return collections[name]
+    except KeyError:
+        raise RuntimeError("Database connection not established. Please ensure the application has started properly.")
+
+def supports_transactions() -> bool:
+    """Indique si le déploiement connecté accepte les transactions multi-documents"""
+    return client.topology_description.topology_type_name in ("ReplicaSetWithPrimary", "Sharded")
+
+async def insert_in_batches(collection: AsyncCollection, items: List[BaseModel], session: Optional[AsyncClientSession] = None):
+    """Insère des entrées par lots de INSERT_BATCH_SIZE, sans s'arrêter au premier document en échec
+
+    Un lot en échec n'interrompt pas les suivants: les erreurs de tous les lots sont regroupées
+    (positions relatives à `items`) dans une seule BulkWriteError levée à la fin.
+    """
+    write_errors = []
+    inserted = 0
+    for start in range(0, len(items), INSERT_BATCH_SIZE):
+        try:
+            result = await collection.insert_many(to_documents(items[start:start + INSERT_BATCH_SIZE]), ordered=False, session=session)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as error:
+            inserted += error.details.get("nInserted", 0)
+            write_errors.extend({**write_error, "index": write_error["index"] + start} for write_error in error.details.get("writeErrors", []))
+    if write_errors:
+        raise BulkWriteError({"writeErrors": write_errors, "writeConcernErrors": [], "nInserted": inserted, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+
+async def insert_sample(name: str, items: List[BaseModel], session: Optional[AsyncClientSession] = None):
+    """Insère un jeu de données d'exemple par lots"""
+    await insert_in_batches(get_collection(name), items, session)
+
 async def initialize_sample_data():
     """Initialise la base de données avec des données d'exemple complètes"""
+    if not SEED_DATA:
+        return
     
-    # Vérifier si les données existent déjà
-    catalog_count = await database.catalogs.count_documents({})
+    # Vérifier si les données existent déjà (lecture des métadonnées, sans parcours de la collection)
+    catalog_count = await database.catalogs.estimated_document_count()
     if catalog_count > 0:
         print("Base de données déjà initialisée")
         return
@@ -75,9 +299,6 @@ async def initialize_sample_data():
         Catalog(id=generate_id(), code_group="STATUS", code="INACTIVE", text="Inactif")
     ]
     
-    for catalog in catalogs:
-        await database.catalogs.insert_one(catalog.dict())
-    
     # ============================================================================
     # 2. PERMIS (Permits)
     # ============================================================================
@@ -89,9 +310,6 @@ async def initialize_sample_data():
         Permit(id=generate_id(), name="Permis de travail sous pression", description="Autorisation pour travaux sous pression")
     ]
     
-    for permit in permits:
-        await database.permits.insert_one(permit.dict())
-    
     # ============================================================================
     # 3. CARACTÉRISTIQUES (Characteristics)
     # ============================================================================
@@ -106,9 +324,6 @@ async def initialize_sample_data():
         Characteristic(id=generate_id(), name="Heures", description="Heures de fonctionnement", unit_of_measurement=UnitOfMeasurement.HOURS)
     ]
     
-    for char in characteristics:
-        await database.characteristics.insert_one(char.dict())
-    
     # ============================================================================
     # 4. CLASSES (Classes)
     # ============================================================================
@@ -120,9 +335,6 @@ async def initialize_sample_data():
         Class(id=generate_id(), name="Compresseurs", description="Classe pour les compresseurs", characteristics=[characteristics[0].id, characteristics[2].id, characteristics[3].id])
     ]
     
-    for cls in classes:
-        await database.classes.insert_one(cls.dict())
-    
     # ============================================================================
     # 5. STRATÉGIES DE MAINTENANCE (Maintenance Strategies)
     # ============================================================================
@@ -134,9 +346,6 @@ async def initialize_sample_data():
         MaintenanceStrategy(id=generate_id(), name="Maintenance proactive", description="Stratégie proactive pour éviter les pannes")
     ]
     
-    for strategy in strategies:
-        await database.maintenance_strategies.insert_one(strategy.dict())
-    
     # ============================================================================
     # 6. ENSEMBLES DE CYCLES (Cycle Sets)
     # ============================================================================
@@ -147,9 +356,6 @@ async def initialize_sample_data():
         CycleSet(id=generate_id(), name="Cycle critique", description="Cycle pour équipements critiques", cycles=["1 MONTH", "100 H", "200 CYCLES"])
     ]
     
-    for cycle_set in cycle_sets:
-        await database.cycle_sets.insert_one(cycle_set.dict())
-    
     # ============================================================================
     # 7. HIÉRARCHIES DES CENTRES DE TRAVAIL (Work Center Hierarchies)
     # ============================================================================
@@ -160,9 +366,6 @@ async def initialize_sample_data():
         WorkCenterHierarchy(id=generate_id(), name="Hiérarchie instrumentation", description="Hiérarchie pour l'instrumentation")
     ]
     
-    for hierarchy in hierarchies:
-        await database.work_center_hierarchies.insert_one(hierarchy.dict())
-    
     # ============================================================================
     # 8. CENTRES DE TRAVAIL (Work Centers)
     # ============================================================================
@@ -174,9 +377,6 @@ async def initialize_sample_data():
         WorkCenter(id=generate_id(), name="Équipe mobile", cost_center="CC005", employee_id="EMP005", hierarchy_id=hierarchies[0].id)
     ]
     
-    for work_center in work_centers:
-        await database.work_centers.insert_one(work_center.dict())
-    
     # ============================================================================
     # 9. MATÉRIELS (Materials)
     # ============================================================================
@@ -191,9 +391,6 @@ async def initialize_sample_data():
         Material(id=generate_id(), name="Transmetteur de pression", description="Transmetteur 4-20mA", cost_center="CC003", profit_center="PC003", uom=UnitOfMeasurement.KILOGRAMS)
     ]
     
-    for material in materials:
-        await database.materials.insert_one(material.dict())
-    
     # ============================================================================
     # 10. NOMENCLATURES (Bill of Materials)
     # ============================================================================
@@ -204,9 +401,6 @@ async def initialize_sample_data():
         BillOfMaterial(id=generate_id(), name="BOM Système de Lubrification", material_id=materials[3].id)
     ]
     
-    for bom in boms:
-        await database.bill_of_materials.insert_one(bom.dict())
-    
     # ============================================================================
     # 11. POSTES TECHNIQUES (Functional Locations)
     # ============================================================================
@@ -217,9 +411,6 @@ async def initialize_sample_data():
         FunctionalLocation(id=generate_id(), name="Zone D - Transport", description="Zone D de transport", main_work_center_id=work_centers[3].id, cost_center="CC004", class_id=classes[3].id, characteristics=[characteristics[3].id, characteristics[6].id], asset_id="ASSET004", permits=[permits[3].id])
     ]
     
-    for fl in functional_locations:
-        await database.functional_locations.insert_one(fl.dict())
-    
     # ============================================================================
     # 12. ÉQUIPEMENTS (Equipment)
     # ============================================================================
@@ -231,9 +422,6 @@ async def initialize_sample_data():
         Equipment(id=generate_id(), name="Compresseur Air COMP-001", description="Compresseur d'air principal", functional_location_id=functional_locations[0].id, main_work_center_id=work_centers[0].id, cost_center="CC001", class_id=classes[4].id, characteristics=[characteristics[0].id, characteristics[2].id], asset_id="ASSET005", permits=[permits[4].id])
     ]
     
-    for eq in equipment:
-        await database.equipment.insert_one(eq.dict())
-    
     # ============================================================================
     # 13. POINTS DE MESURE (Measuring Points)
     # ============================================================================
@@ -245,9 +433,6 @@ async def initialize_sample_data():
         MeasuringPoint(id=generate_id(), name="MP-005", description="Point de mesure vitesse convoyeur", target_object_type="EQUIPMENT", target_object_id=equipment[3].id, characteristic_id=characteristics[3].id, catalog_code_groups=["DEFAULTS"])
     ]
     
-    for mp in measuring_points:
-        await database.measuring_points.insert_one(mp.dict())
-    
     # ============================================================================
     # 14. COMPTEURS (Counters)
     # ============================================================================
@@ -258,9 +443,6 @@ async def initialize_sample_data():
         Counter(id=generate_id(), name="Compteur distance C-001", description="Compteur de distance convoyeur", target_object_type="EQUIPMENT", target_object_id=equipment[3].id, characteristic_id=characteristics[6].id, current_reading=150.5)
     ]
     
-    for counter in counters:
-        await database.counters.insert_one(counter.dict())
-    
     # ============================================================================
     # 15. NUMÉROS DE SÉRIE (Serial Numbers)
     # ============================================================================
@@ -272,9 +454,6 @@ async def initialize_sample_data():
         SerialNumber(id=generate_id(), serial_number="SN-COMP001-2024-005", material_id=materials[4].id, equipment_id=equipment[4].id)
     ]
     
-    for sn in serial_numbers:
-        await database.serial_numbers.insert_one(sn.dict())
-    
     # ============================================================================
     # 16. NOMENCLATURES DE POSTES TECHNIQUES (Functional Location BOMs)
     # ============================================================================
@@ -285,9 +464,6 @@ async def initialize_sample_data():
         FunctionalLocationBOM(id=generate_id(), functional_location_id=functional_locations[3].id, material_master_id=materials[3].id)
     ]
     
-    for fl_bom in fl_boms:
-        await database.functional_location_boms.insert_one(fl_bom.dict())
-    
     # ============================================================================
     # 17. NOMENCLATURES D'ÉQUIPEMENTS (Equipment BOMs)
     # ============================================================================
@@ -299,9 +475,6 @@ async def initialize_sample_data():
         EquipmentBOM(id=generate_id(), equipment_id=equipment[4].id, material_master_id=materials[4].id)
     ]
     
-    for eq_bom in eq_boms:
-        await database.equipment_boms.insert_one(eq_bom.dict())
-    
     # ============================================================================
     # 18. GAMMES GÉNÉRALES (General Task Lists)
     # ============================================================================
@@ -312,9 +485,6 @@ async def initialize_sample_data():
         GeneralTaskList(id=generate_id(), name="Gamme générale convoyeurs", main_work_center_id=work_centers[3].id, maintenance_strategy_id=strategies[3].id, material_id=materials[3].id, activity_type=ActivityType.CORRECTIVE)
     ]
     
-    for gtl in general_task_lists:
-        await database.general_task_lists.insert_one(gtl.dict())
-    
     # ============================================================================
     # 19. GAMMES POUR ÉQUIPEMENTS (Equipment Task Lists)
     # ============================================================================
@@ -326,9 +496,6 @@ async def initialize_sample_data():
         EquipmentTaskList(id=generate_id(), name="Gamme COMP-001", equipment_id=equipment[4].id, main_work_center_id=work_centers[0].id, maintenance_strategy_id=strategies[4].id, material_id=materials[4].id, activity_type=ActivityType.CALIBRATION)
     ]
     
-    for etl in equipment_task_lists:
-        await database.equipment_task_lists.insert_one(etl.dict())
-    
     # ============================================================================
     # 20. GAMMES POUR POSTES TECHNIQUES (Functional Location Task Lists)
     # ============================================================================
@@ -339,9 +506,6 @@ async def initialize_sample_data():
         FunctionalLocationTaskList(id=generate_id(), name="Gamme Zone D", functional_location_id=functional_locations[3].id, main_work_center_id=work_centers[3].id, maintenance_strategy_id=strategies[3].id, material_id=materials[3].id, activity_type=ActivityType.CORRECTIVE)
     ]
     
-    for fltl in fl_task_lists:
-        await database.functional_location_task_lists.insert_one(fltl.dict())
-    
     # ============================================================================
     # 21. PLANS À CYCLE SIMPLE (Single Cycle Plans)
     # ============================================================================
@@ -351,9 +515,6 @@ async def initialize_sample_data():
         SingleCyclePlan(id=generate_id(), name="Plan maintenance C-001", task_list_id=equipment_task_lists[3].id, equipment_id=equipment[3].id, functional_location_id=functional_locations[3].id, counter_id=counters[2].id)
     ]
     
-    for scp in single_cycle_plans:
-        await database.single_cycle_plans.insert_one(scp.dict())
-    
     # ============================================================================
     # 22. PLANS DE MAINTENANCE STRATÉGIQUE (Strategy Maintenance Plans)
     # ============================================================================
@@ -363,9 +524,6 @@ async def initialize_sample_data():
         StrategyMaintenancePlan(id=generate_id(), name="Plan stratégique COMP-001", task_list_id=equipment_task_lists[4].id, equipment_id=equipment[4].id, functional_location_id=functional_locations[0].id, counter_id=counters[0].id, maintenance_strategy_id=strategies[4].id)
     ]
     
-    for smp in strategy_maintenance_plans:
-        await database.strategy_maintenance_plans.insert_one(smp.dict())
-    
     # ============================================================================
     # 23. PLANS À PLUSIEURS COMPTEURS (Multiple Counter Plans)
     # ============================================================================
@@ -374,9 +532,6 @@ async def initialize_sample_data():
         MultipleCounterPlan(id=generate_id(), name="Plan multi-compteurs P-001", task_list_id=equipment_task_lists[0].id, equipment_id=equipment[0].id, functional_location_id=functional_locations[0].id, counter_id=counters[0].id, cycle_set_id=cycle_sets[1].id)
     ]
     
-    for mcp in multiple_counter_plans:
-        await database.multiple_counter_plans.insert_one(mcp.dict())
-    
     # ============================================================================
     # 24. VALEURS CARACTÉRISTIQUES (Characteristic Values)
     # ============================================================================
@@ -388,13 +543,11 @@ async def initialize_sample_data():
         CharacteristicValues(id=generate_id(), class_id=classes[2].id, characteristic_id=characteristics[4].id, value="85.0", master_data_object_id=equipment[2].id, master_data_object_type="EQUIPMENT")
     ]
     
-    for cv in characteristic_values:
-        await database.characteristic_values.insert_one(cv.dict())
-    
     # ============================================================================
     # 25. NOTIFICATIONS (Notifications)
     # ============================================================================
-    from datetime import datetime, timedelta
+    # Horodatage de référence unique: les dates relatives de l'échantillon restent cohérentes entre elles
+    now = datetime.now()
     
     notifications = [
         Notification(
@@ -404,7 +557,7 @@ async def initialize_sample_data():
             status=NotificationStatus.CREATED,
             priority=NotificationPriority.HIGH,
             notification_type=NotificationType.BREAKDOWN,
-            created_date=datetime.now() - timedelta(hours=2),
+            created_date=now - timedelta(hours=2),
             created_by="OPERATEUR_001",
             equipment_id=equipment[0].id,
             work_center_id=work_centers[0].id,
@@ -418,14 +571,14 @@ async def initialize_sample_data():
             status=NotificationStatus.IN_PROGRESS,
             priority=NotificationPriority.MEDIUM,
             notification_type=NotificationType.PREVENTIVE,
-            created_date=datetime.now() - timedelta(days=1),
+            created_date=now - timedelta(days=1),
             created_by="PLANIFICATEUR_001",
             equipment_id=equipment[1].id,
             work_center_id=work_centers[1].id,
             assigned_to="TECHNICIEN_002",
             estimated_duration=8.0,
             actual_duration=6.5,
-            completion_date=datetime.now() - timedelta(hours=2)
+            completion_date=now - timedelta(hours=2)
         ),
         Notification(
             id=generate_id(),
@@ -434,14 +587,14 @@ async def initialize_sample_data():
             status=NotificationStatus.COMPLETED,
             priority=NotificationPriority.CRITICAL,
             notification_type=NotificationType.SAFETY,
-            created_date=datetime.now() - timedelta(days=2),
+            created_date=now - timedelta(days=2),
             created_by="SECURITE_001",
             functional_location_id=functional_locations[0].id,
             work_center_id=work_centers[0].id,
             assigned_to="INSPECTEUR_001",
             estimated_duration=2.0,
             actual_duration=1.5,
-            completion_date=datetime.now() - timedelta(days=1)
+            completion_date=now - timedelta(days=1)
         ),
         Notification(
             id=generate_id(),
@@ -450,7 +603,7 @@ async def initialize_sample_data():
             status=NotificationStatus.CREATED,
             priority=NotificationPriority.LOW,
             notification_type=NotificationType.CALIBRATION,
-            created_date=datetime.now() - timedelta(hours=1),
+            created_date=now - timedelta(hours=1),
             created_by="QUALITE_001",
             equipment_id=equipment[2].id,
             work_center_id=work_centers[2].id,
@@ -458,9 +611,6 @@ async def initialize_sample_data():
         )
     ]
     
-    for notification in notifications:
-        await database.notifications.insert_one(notification.dict())
-    
     # ============================================================================
     # 26. ORDRES (Orders)
     # ============================================================================
@@ -472,14 +622,14 @@ async def initialize_sample_data():
             description="Réparation complète du moteur de la pompe P-001 suite à la panne signalée",
             status=OrderStatus.IN_PROGRESS,
             order_type=OrderType.CORRECTIVE,
-            created_date=datetime.now() - timedelta(hours=1),
+            created_date=now - timedelta(hours=1),
             created_by="TECHNICIEN_001",
             equipment_id=equipment[0].id,
             work_center_id=work_centers[0].id,
             assigned_to="TECHNICIEN_001",
-            planned_start_date=datetime.now() - timedelta(hours=1),
-            planned_end_date=datetime.now() + timedelta(hours=3),
-            actual_start_date=datetime.now() - timedelta(hours=1),
+            planned_start_date=now - timedelta(hours=1),
+            planned_end_date=now + timedelta(hours=3),
+            actual_start_date=now - timedelta(hours=1),
             estimated_duration=4.0,
             actual_duration=2.5,
             priority=NotificationPriority.HIGH,
@@ -494,15 +644,15 @@ async def initialize_sample_data():
             description="Maintenance préventive programmée pour le compresseur M-001",
             status=OrderStatus.COMPLETED,
             order_type=OrderType.PREVENTIVE,
-            created_date=datetime.now() - timedelta(days=1),
+            created_date=now - timedelta(days=1),
             created_by="PLANIFICATEUR_001",
             equipment_id=equipment[1].id,
             work_center_id=work_centers[1].id,
             assigned_to="TECHNICIEN_002",
-            planned_start_date=datetime.now() - timedelta(days=1),
-            planned_end_date=datetime.now() - timedelta(hours=2),
-            actual_start_date=datetime.now() - timedelta(days=1),
-            actual_end_date=datetime.now() - timedelta(hours=2),
+            planned_start_date=now - timedelta(days=1),
+            planned_end_date=now - timedelta(hours=2),
+            actual_start_date=now - timedelta(days=1),
+            actual_end_date=now - timedelta(hours=2),
             estimated_duration=8.0,
             actual_duration=6.5,
             priority=NotificationPriority.MEDIUM,
@@ -518,15 +668,15 @@ async def initialize_sample_data():
             description="Inspection de sécurité complète de la zone A",
             status=OrderStatus.COMPLETED,
             order_type=OrderType.INSPECTION,
-            created_date=datetime.now() - timedelta(days=2),
+            created_date=now - timedelta(days=2),
             created_by="SECURITE_001",
             functional_location_id=functional_locations[0].id,
             work_center_id=work_centers[0].id,
             assigned_to="INSPECTEUR_001",
-            planned_start_date=datetime.now() - timedelta(days=2),
-            planned_end_date=datetime.now() - timedelta(days=1),
-            actual_start_date=datetime.now() - timedelta(days=2),
-            actual_end_date=datetime.now() - timedelta(days=1),
+            planned_start_date=now - timedelta(days=2),
+            planned_end_date=now - timedelta(days=1),
+            actual_start_date=now - timedelta(days=2),
+            actual_end_date=now - timedelta(days=1),
             estimated_duration=2.0,
             actual_duration=1.5,
             priority=NotificationPriority.CRITICAL,
@@ -540,13 +690,13 @@ async def initialize_sample_data():
             description="Calibration du capteur de température sur l'équipement C-001",
             status=OrderStatus.CREATED,
             order_type=OrderType.CALIBRATION,
-            created_date=datetime.now() - timedelta(hours=1),
+            created_date=now - timedelta(hours=1),
             created_by="QUALITE_001",
             equipment_id=equipment[2].id,
             work_center_id=work_centers[2].id,
             assigned_to="TECHNICIEN_003",
-            planned_start_date=datetime.now() + timedelta(hours=2),
-            planned_end_date=datetime.now() + timedelta(hours=3),
+            planned_start_date=now + timedelta(hours=2),
+            planned_end_date=now + timedelta(hours=3),
             estimated_duration=1.0,
             priority=NotificationPriority.LOW,
             cost_center="CC-QUAL-001",
@@ -554,40 +704,58 @@ async def initialize_sample_data():
         )
     ]
     
-    for order in orders:
-        await database.orders.insert_one(order.dict())
-    
-    print("✅ Données de simulation RAGENNT4SAP initialisées avec succès!")
-    print(f"📊 Collections créées: {len(database.list_collection_names())}")
-    print("🎯 Base de données prête pour les tests!")
-
-async def get_all_data() -> Dict[str, Any]:
-    """Retourne toutes les données de la base"""
-    return {
-        "catalogs": await database.catalogs.find().to_list(length=None),
-        "permits": await database.permits.find().to_list(length=None),
-        "characteristics": await database.characteristics.find().to_list(length=None),
-        "classes": await database.classes.find().to_list(length=None),
-        "maintenance_strategies": await database.maintenance_strategies.find().to_list(length=None),
-        "cycle_sets": await database.cycle_sets.find().to_list(length=None),
-        "work_center_hierarchies": await database.work_center_hierarchies.find().to_list(length=None),
-        "work_centers": await database.work_centers.find().to_list(length=None),
-        "materials": await database.materials.find().to_list(length=None),
-        "bill_of_materials": await database.bill_of_materials.find().to_list(length=None),
-        "functional_locations": await database.functional_locations.find().to_list(length=None),
-        "equipment": await database.equipment.find().to_list(length=None),
-        "measuring_points": await database.measuring_points.find().to_list(length=None),
-        "counters": await database.counters.find().to_list(length=None),
-        "serial_numbers": await database.serial_numbers.find().to_list(length=None),
-        "functional_location_boms": await database.functional_location_boms.find().to_list(length=None),
-        "equipment_boms": await database.equipment_boms.find().to_list(length=None),
-        "general_task_lists": await database.general_task_lists.find().to_list(length=None),
-        "equipment_task_lists": await database.equipment_task_lists.find().to_list(length=None),
-        "functional_location_task_lists": await database.functional_location_task_lists.find().to_list(length=None),
-        "single_cycle_plans": await database.single_cycle_plans.find().to_list(length=None),
-        "strategy_maintenance_plans": await database.strategy_maintenance_plans.find().to_list(length=None),
-        "multiple_counter_plans": await database.multiple_counter_plans.find().to_list(length=None),
-        "characteristic_values": await database.characteristic_values.find().to_list(length=None),
-        "notifications": await database.notifications.find().to_list(length=None),
-        "orders": await database.orders.find().to_list(length=None)
-    }
+    samples = [
+        ("catalogs", catalogs),
+        ("permits", permits),
+        ("characteristics", characteristics),
+        ("classes", classes),
+        ("maintenance_strategies", strategies),
+        ("cycle_sets", cycle_sets),
+        ("work_center_hierarchies", hierarchies),
+        ("work_centers", work_centers),
+        ("materials", materials),
+        ("bill_of_materials", boms),
+        ("functional_locations", functional_locations),
+        ("equipment", equipment),
+        ("measuring_points", measuring_points),
+        ("counters", counters),
+        ("serial_numbers", serial_numbers),
+        ("functional_location_boms", fl_boms),
+        ("equipment_boms", eq_boms),
+        ("general_task_lists", general_task_lists),
+        ("equipment_task_lists", equipment_task_lists),
+        ("functional_location_task_lists", fl_task_lists),
+        ("single_cycle_plans", single_cycle_plans),
+        ("strategy_maintenance_plans", strategy_maintenance_plans),
+        ("multiple_counter_plans", multiple_counter_plans),
+        ("characteristic_values", characteristic_values),
+        ("notifications", notifications),
+        ("orders", orders),
+    ]
+
+    if supports_transactions():
+        # Replica set / sharding: tout le jeu d'exemple est validé d'un bloc, un arrêt en cours
+        # d'initialisation ne laisse pas de base partiellement remplie. Une session ne pouvant
+        # porter qu'une opération à la fois, les insertions y sont séquentielles
+        async with client.start_session() as session:
+            async with await session.start_transaction():
+                for name, items in samples:
+                    await insert_sample(name, items, session)
+    else:
+        # Instance autonome (développement): pas de transaction possible. Les références entre
+        # entités reposent sur des IDs générés côté client, aucune insertion ne dépend d'une
+        # autre et toutes les collections sont donc écrites en parallèle
+        await asyncio.gather(*(insert_sample(name, items) for name, items in samples))
+
+    # Le nombre de collections remplies est connu localement: pas d'aller-retour list_collection_names
+    print(f"✅ Données de simulation RAGENNT4SAP initialisées: {sum(1 for _, items in samples if items)} collections remplies, base prête pour les tests")
+
+# Plafond de documents renvoyés par collection dans l'export complet, lus par lots
+ALL_DATA_MAX_DOCUMENTS = 10_000
+ALL_DATA_BATCH_SIZE = 1000
+
+async def iter_collection(name: str, limit: int = ALL_DATA_MAX_DOCUMENTS, projection: Optional[Dict[str, int]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Parcourt les documents d'une collection lot par lot (`limit` documents au plus)"""
+    cursor = get_collection(name).find({}, projection).limit(limit).batch_size(ALL_DATA_BATCH_SIZE)
+    async for doc in cursor:
+        yield from_document(doc)
@@ -3,38 +3,171 @@ API FastAPI pour le simulateur SAP PM
 Contient tous les endpoints pour gérer les données SAP PM
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Body, Path, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
-from typing import List, Dict, Any
+from importlib.util import find_spec
+from typing import AsyncIterator, List, Dict, Any, Optional
+from pydantic import BaseModel
+import hashlib
+import os
+import orjson
 import uvicorn
 
-from database import connect_to_mongo, close_mongo_connection, initialize_sample_data
-from crud import *
-from schemas import *
+from database import ALL_DATA_MAX_DOCUMENTS, COLLECTIONS, iter_collection, list_adapter, connect_to_mongo, close_mongo_connection, connect_to_redis, close_redis_connection, ensure_indexes, migrate_legacy_ids, initialize_sample_data
+from crud import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, iter_documents, CRUDRepository, catalogs_crud,
+    permits_crud, characteristics_crud, classes_crud, maintenance_strategies_crud,
+    cycle_sets_crud, work_center_hierarchies_crud, work_centers_crud, materials_crud,
+    create_many_materials, bill_of_materials_crud, get_many_bill_of_materials,
+    functional_locations_crud, upsert_many_functional_locations, equipment_crud,
+    create_many_equipment, upsert_many_equipment, get_equipment_by_functional_location,
+    get_equipment_full, measuring_points_crud, create_many_measuring_points,
+    get_measuring_points_by_object, counters_crud, create_many_counters, get_counters_by_object,
+    serial_numbers_crud, create_many_serial_numbers, get_serial_numbers_by_equipment,
+    functional_location_boms_crud, get_many_functional_location_boms,
+    get_boms_for_functional_location, equipment_boms_crud, get_many_equipment_boms,
+    get_boms_for_equipment, general_task_lists_crud, get_many_general_task_lists,
+    equipment_task_lists_crud, get_many_equipment_task_lists, get_task_lists_for_equipment,
+    functional_location_task_lists_crud, create_many_functional_location_task_lists,
+    update_many_functional_location_task_lists, delete_many_functional_location_task_lists,
+    get_task_lists_for_functional_location, single_cycle_plans_crud,
+    create_many_single_cycle_plans, update_many_single_cycle_plans,
+    delete_many_single_cycle_plans, strategy_maintenance_plans_crud,
+    create_many_strategy_maintenance_plans, update_many_strategy_maintenance_plans,
+    delete_many_strategy_maintenance_plans, multiple_counter_plans_crud,
+    create_many_multiple_counter_plans, update_many_multiple_counter_plans,
+    delete_many_multiple_counter_plans, characteristic_values_crud,
+    create_many_characteristic_values, update_many_characteristic_values,
+    delete_many_characteristic_values, notifications_crud, create_many_notifications,
+    update_many_notifications, delete_many_notifications, patch_notification,
+    get_notifications_filtered, get_notification_stats, get_notifications_by_equipment,
+    get_notifications_by_status, get_notifications_by_priority, orders_crud, create_many_orders,
+    get_many_orders, get_orders_filtered, update_many_orders, delete_many_orders, patch_order,
+    get_order_stats, get_orders_by_equipment, get_orders_for_equipments, get_orders_by_status,
+    get_order_summaries_by_status, get_orders_by_type, get_orders_by_work_center,
+)
+from schemas import (
+    Material, BillOfMaterial, FunctionalLocation, Equipment, MeasuringPoint, Counter,
+    SerialNumber, FunctionalLocationBOM, EquipmentBOM, GeneralTaskList, EquipmentTaskList,
+    FunctionalLocationTaskList, SingleCyclePlan, StrategyMaintenancePlan, MultipleCounterPlan,
+    CharacteristicValues, Notification, NotificationUpdate, Order, OrderUpdate,
+)
 
 # Configuration de l'application FastAPI
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Démarrage
     await connect_to_mongo()
+    await connect_to_redis()
+    await migrate_legacy_ids()
     await initialize_sample_data()
+    await ensure_indexes()
+    # Schéma OpenAPI généré une fois au démarrage (FastAPI le conserve dans app.openapi_schema)
+    # plutôt qu'au premier accès à /docs
+    app.openapi()
     yield
     # Arrêt
+    await close_redis_connection()
     await close_mongo_connection()
 
 app = FastAPI(
     title="SAP PM Simulator API",
     description="API pour simuler les données SAP Plant Maintenance",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Configuration CORS
+async def encode_list(documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode une liste JSON document par document (orjson)"""
+    separator = b"["
+    async for document in documents:
+        yield separator + orjson.dumps(document)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
+
+def list_response(documents: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Diffuse une liste JSON document par document (orjson), sans repasser par Pydantic"""
+    return StreamingResponse(encode_list(documents), media_type="application/json")
+
+def items_response(items: List[BaseModel]) -> ORJSONResponse:
+    """Sérialise une liste déjà chargée avec orjson, sans repasser par la validation du response_model"""
+    if not items:
+        return ORJSONResponse([])
+    return ORJSONResponse(list_adapter(type(items[0])).dump_python(items))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compare If-None-Match à un ETag (comparaison faible): liste séparée par des virgules, préfixe W/ ignoré, `*` accepté"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def etag_response(request: Request, item: BaseModel) -> Response:
+    """Sérialise une entrée avec un ETag (empreinte du contenu); 304 sans corps si le client a déjà cette version"""
+    content = orjson.dumps(item.model_dump())
+    etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    # Revalidation systématique: les entrées sont modifiables, seule la version déjà reçue est réutilisée
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type="application/json", headers=headers)
+
+def register_crud(prefix: str, repository: CRUDRepository, item_name: str, id_param: str, deleted_message: str, descriptions: Dict[str, str]):
+    """Enregistre les routes CRUD standard d'une famille d'entités
+
+    `descriptions` donne la description de chaque route ("create", "list", "get", "update",
+    "delete"); sans clé "list", la famille déclare elle-même sa route de liste. Les noms de route
+    et de paramètre d'ID reprennent ceux des endpoints écrits à la main. La liste est triée par
+    ID: `after` (ID du dernier élément reçu) donne la page suivante sans `skip`.
+    À appeler après les routes statiques de la famille (`/bulk`, `/stats`...), qui doivent
+    passer avant `/{id}`.
+    """
+    model = repository.model
+    item_path = f"{prefix}/{{{id_param}}}"
+
+    async def create_endpoint(item: model):
+        return await repository.create(item)
+
+    async def list_endpoint(skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+        return list_response(iter_documents(repository.collection_name, model, skip, limit, after=after))
+
+    async def get_endpoint(request: Request, item_id: str = Path(..., alias=id_param)):
+        item = await repository.get(item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail=repository.not_found_detail)
+        return etag_response(request, item)
+
+    async def update_endpoint(item: model, item_id: str = Path(..., alias=id_param)):
+        return await repository.update(item_id, item)
+
+    async def delete_endpoint(item_id: str = Path(..., alias=id_param)):
+        success = await repository.delete(item_id)
+        if not success:
+            raise HTTPException(status_code=404, detail=repository.not_found_detail)
+        return {"message": deleted_message}
+
+    app.post(f"{prefix}/", response_model=model, name=f"create_{item_name}_endpoint", description=descriptions["create"])(create_endpoint)
+    if "list" in descriptions:
+        app.get(f"{prefix}/", response_model=List[model], name=f"get_all_{repository.collection_name}_endpoint", description=descriptions["list"])(list_endpoint)
+    app.get(item_path, response_model=model, name=f"get_{item_name}_endpoint", description=descriptions["get"])(get_endpoint)
+    app.put(item_path, response_model=model, name=f"update_{item_name}_endpoint", description=descriptions["update"])(update_endpoint)
+    app.delete(item_path, name=f"delete_{item_name}_endpoint", description=descriptions["delete"])(delete_endpoint)
+
+# Configuration CORS: origines autorisées séparées par des virgules dans CORS_ORIGINS (toutes par
+# défaut). Les identifiants ne sont acceptés que pour une liste explicite: avec "*" et credentials,
+# Starlette devrait recopier l'origine de chaque requête dans la réponse
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",")]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -43,946 +176,616 @@ app.add_middleware(
 # ENDPOINTS POUR CATALOGUES
 # ============================================================================
 
-@app.post("/catalogs/", response_model=Catalog)
-async def create_catalog_endpoint(catalog: Catalog):
-    """Crée un nouveau catalogue"""
-    return await create_catalog(catalog)
-
-@app.get("/catalogs/", response_model=List[Catalog])
-async def get_all_catalogs_endpoint():
-    """Récupère tous les catalogues"""
-    return await get_all_catalogs()
-
-@app.get("/catalogs/{catalog_id}", response_model=Catalog)
-async def get_catalog_endpoint(catalog_id: str):
-    """Récupère un catalogue par ID"""
-    catalog = await get_catalog(catalog_id)
-    if not catalog:
-        raise HTTPException(status_code=404, detail="Catalogue non trouvé")
-    return catalog
-
-@app.put("/catalogs/{catalog_id}", response_model=Catalog)
-async def update_catalog_endpoint(catalog_id: str, catalog: Catalog):
-    """Met à jour un catalogue"""
-    return await update_catalog(catalog_id, catalog)
-
-@app.delete("/catalogs/{catalog_id}")
-async def delete_catalog_endpoint(catalog_id: str):
-    """Supprime un catalogue"""
-    success = await delete_catalog(catalog_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Catalogue non trouvé")
-    return {"message": "Catalogue supprimé avec succès"}
+register_crud("/catalogs", catalogs_crud, "catalog", "catalog_id", "Catalogue supprimé avec succès", {
+    "create": "Crée un nouveau catalogue",
+    "list": "Récupère tous les catalogues",
+    "get": "Récupère un catalogue par ID",
+    "update": "Met à jour un catalogue",
+    "delete": "Supprime un catalogue",
+})
 
 # ============================================================================
 # ENDPOINTS POUR PERMIS
 # ============================================================================
 
-@app.post("/permits/", response_model=Permit)
-async def create_permit_endpoint(permit: Permit):
-    """Crée un nouveau permis"""
-    return await create_permit(permit)
-
-@app.get("/permits/", response_model=List[Permit])
-async def get_all_permits_endpoint():
-    """Récupère tous les permis"""
-    return await get_all_permits()
-
-@app.get("/permits/{permit_id}", response_model=Permit)
-async def get_permit_endpoint(permit_id: str):
-    """Récupère un permis par ID"""
-    permit = await get_permit(permit_id)
-    if not permit:
-        raise HTTPException(status_code=404, detail="Permis non trouvé")
-    return permit
-
-@app.put("/permits/{permit_id}", response_model=Permit)
-async def update_permit_endpoint(permit_id: str, permit: Permit):
-    """Met à jour un permis"""
-    return await update_permit(permit_id, permit)
-
-@app.delete("/permits/{permit_id}")
-async def delete_permit_endpoint(permit_id: str):
-    """Supprime un permis"""
-    success = await delete_permit(permit_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Permis non trouvé")
-    return {"message": "Permis supprimé avec succès"}
+register_crud("/permits", permits_crud, "permit", "permit_id", "Permis supprimé avec succès", {
+    "create": "Crée un nouveau permis",
+    "list": "Récupère tous les permis",
+    "get": "Récupère un permis par ID",
+    "update": "Met à jour un permis",
+    "delete": "Supprime un permis",
+})
 
 # ============================================================================
 # ENDPOINTS POUR CARACTÉRISTIQUES
 # ============================================================================
 
-@app.post("/characteristics/", response_model=Characteristic)
-async def create_characteristic_endpoint(characteristic: Characteristic):
-    """Crée une nouvelle caractéristique"""
-    return await create_characteristic(characteristic)
-
-@app.get("/characteristics/", response_model=List[Characteristic])
-async def get_all_characteristics_endpoint():
-    """Récupère toutes les caractéristiques"""
-    return await get_all_characteristics()
-
-@app.get("/characteristics/{characteristic_id}", response_model=Characteristic)
-async def get_characteristic_endpoint(characteristic_id: str):
-    """Récupère une caractéristique par ID"""
-    characteristic = await get_characteristic(characteristic_id)
-    if not characteristic:
-        raise HTTPException(status_code=404, detail="Caractéristique non trouvée")
-    return characteristic
-
-@app.put("/characteristics/{characteristic_id}", response_model=Characteristic)
-async def update_characteristic_endpoint(characteristic_id: str, characteristic: Characteristic):
-    """Met à jour une caractéristique"""
-    return await update_characteristic(characteristic_id, characteristic)
-
-@app.delete("/characteristics/{characteristic_id}")
-async def delete_characteristic_endpoint(characteristic_id: str):
-    """Supprime une caractéristique"""
-    success = await delete_characteristic(characteristic_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Caractéristique non trouvée")
-    return {"message": "Caractéristique supprimée avec succès"}
+register_crud("/characteristics", characteristics_crud, "characteristic", "characteristic_id", "Caractéristique supprimée avec succès", {
+    "create": "Crée une nouvelle caractéristique",
+    "list": "Récupère toutes les caractéristiques",
+    "get": "Récupère une caractéristique par ID",
+    "update": "Met à jour une caractéristique",
+    "delete": "Supprime une caractéristique",
+})
 
 # ============================================================================
 # ENDPOINTS POUR CLASSES
 # ============================================================================
 
-@app.post("/classes/", response_model=Class)
-async def create_class_endpoint(cls: Class):
-    """Crée une nouvelle classe"""
-    return await create_class(cls)
-
-@app.get("/classes/", response_model=List[Class])
-async def get_all_classes_endpoint():
-    """Récupère toutes les classes"""
-    return await get_all_classes()
-
-@app.get("/classes/{class_id}", response_model=Class)
-async def get_class_endpoint(class_id: str):
-    """Récupère une classe par ID"""
-    cls = await get_class(class_id)
-    if not cls:
-        raise HTTPException(status_code=404, detail="Classe non trouvée")
-    return cls
-
-@app.put("/classes/{class_id}", response_model=Class)
-async def update_class_endpoint(class_id: str, cls: Class):
-    """Met à jour une classe"""
-    return await update_class(class_id, cls)
-
-@app.delete("/classes/{class_id}")
-async def delete_class_endpoint(class_id: str):
-    """Supprime une classe"""
-    success = await delete_class(class_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Classe non trouvée")
-    return {"message": "Classe supprimée avec succès"}
+register_crud("/classes", classes_crud, "class", "class_id", "Classe supprimée avec succès", {
+    "create": "Crée une nouvelle classe",
+    "list": "Récupère toutes les classes",
+    "get": "Récupère une classe par ID",
+    "update": "Met à jour une classe",
+    "delete": "Supprime une classe",
+})
 
 # ============================================================================
 # ENDPOINTS POUR STRATÉGIES DE MAINTENANCE
 # ============================================================================
 
-@app.post("/maintenance-strategies/", response_model=MaintenanceStrategy)
-async def create_maintenance_strategy_endpoint(strategy: MaintenanceStrategy):
-    """Crée une nouvelle stratégie de maintenance"""
-    return await create_maintenance_strategy(strategy)
-
-@app.get("/maintenance-strategies/", response_model=List[MaintenanceStrategy])
-async def get_all_maintenance_strategies_endpoint():
-    """Récupère toutes les stratégies de maintenance"""
-    return await get_all_maintenance_strategies()
-
-@app.get("/maintenance-strategies/{strategy_id}", response_model=MaintenanceStrategy)
-async def get_maintenance_strategy_endpoint(strategy_id: str):
-    """Récupère une stratégie de maintenance par ID"""
-    strategy = await get_maintenance_strategy(strategy_id)
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Stratégie de maintenance non trouvée")
-    return strategy
-
-@app.put("/maintenance-strategies/{strategy_id}", response_model=MaintenanceStrategy)
-async def update_maintenance_strategy_endpoint(strategy_id: str, strategy: MaintenanceStrategy):
-    """Met à jour une stratégie de maintenance"""
-    return await update_maintenance_strategy(strategy_id, strategy)
-
-@app.delete("/maintenance-strategies/{strategy_id}")
-async def delete_maintenance_strategy_endpoint(strategy_id: str):
-    """Supprime une stratégie de maintenance"""
-    success = await delete_maintenance_strategy(strategy_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Stratégie de maintenance non trouvée")
-    return {"message": "Stratégie de maintenance supprimée avec succès"}
+register_crud("/maintenance-strategies", maintenance_strategies_crud, "maintenance_strategy", "strategy_id", "Stratégie de maintenance supprimée avec succès", {
+    "create": "Crée une nouvelle stratégie de maintenance",
+    "list": "Récupère toutes les stratégies de maintenance",
+    "get": "Récupère une stratégie de maintenance par ID",
+    "update": "Met à jour une stratégie de maintenance",
+    "delete": "Supprime une stratégie de maintenance",
+})
 
 # ============================================================================
 # ENDPOINTS POUR ENSEMBLES DE CYCLES
 # ============================================================================
 
-@app.post("/cycle-sets/", response_model=CycleSet)
-async def create_cycle_set_endpoint(cycle_set: CycleSet):
-    """Crée un nouvel ensemble de cycles"""
-    return await create_cycle_set(cycle_set)
-
-@app.get("/cycle-sets/", response_model=List[CycleSet])
-async def get_all_cycle_sets_endpoint():
-    """Récupère tous les ensembles de cycles"""
-    return await get_all_cycle_sets()
-
-@app.get("/cycle-sets/{cycle_set_id}", response_model=CycleSet)
-async def get_cycle_set_endpoint(cycle_set_id: str):
-    """Récupère un ensemble de cycles par ID"""
-    cycle_set = await get_cycle_set(cycle_set_id)
-    if not cycle_set:
-        raise HTTPException(status_code=404, detail="Ensemble de cycles non trouvé")
-    return cycle_set
-
-@app.put("/cycle-sets/{cycle_set_id}", response_model=CycleSet)
-async def update_cycle_set_endpoint(cycle_set_id: str, cycle_set: CycleSet):
-    """Met à jour un ensemble de cycles"""
-    return await update_cycle_set(cycle_set_id, cycle_set)
-
-@app.delete("/cycle-sets/{cycle_set_id}")
-async def delete_cycle_set_endpoint(cycle_set_id: str):
-    """Supprime un ensemble de cycles"""
-    success = await delete_cycle_set(cycle_set_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Ensemble de cycles non trouvé")
-    return {"message": "Ensemble de cycles supprimé avec succès"}
+register_crud("/cycle-sets", cycle_sets_crud, "cycle_set", "cycle_set_id", "Ensemble de cycles supprimé avec succès", {
+    "create": "Crée un nouvel ensemble de cycles",
+    "list": "Récupère tous les ensembles de cycles",
+    "get": "Récupère un ensemble de cycles par ID",
+    "update": "Met à jour un ensemble de cycles",
+    "delete": "Supprime un ensemble de cycles",
+})
 
 # ============================================================================
 # ENDPOINTS POUR HIÉRARCHIES DE CENTRES DE TRAVAIL
 # ============================================================================
 
-@app.post("/work-center-hierarchies/", response_model=WorkCenterHierarchy)
-async def create_work_center_hierarchy_endpoint(hierarchy: WorkCenterHierarchy):
-    """Crée une nouvelle hiérarchie de centre de travail"""
-    return await create_work_center_hierarchy(hierarchy)
-
-@app.get("/work-center-hierarchies/", response_model=List[WorkCenterHierarchy])
-async def get_all_work_center_hierarchies_endpoint():
-    """Récupère toutes les hiérarchies de centres de travail"""
-    return await get_all_work_center_hierarchies()
-
-@app.get("/work-center-hierarchies/{hierarchy_id}", response_model=WorkCenterHierarchy)
-async def get_work_center_hierarchy_endpoint(hierarchy_id: str):
-    """Récupère une hiérarchie de centre de travail par ID"""
-    hierarchy = await get_work_center_hierarchy(hierarchy_id)
-    if not hierarchy:
-        raise HTTPException(status_code=404, detail="Hiérarchie de centre de travail non trouvée")
-    return hierarchy
-
-@app.put("/work-center-hierarchies/{hierarchy_id}", response_model=WorkCenterHierarchy)
-async def update_work_center_hierarchy_endpoint(hierarchy_id: str, hierarchy: WorkCenterHierarchy):
-    """Met à jour une hiérarchie de centre de travail"""
-    return await update_work_center_hierarchy(hierarchy_id, hierarchy)
-
-@app.delete("/work-center-hierarchies/{hierarchy_id}")
-async def delete_work_center_hierarchy_endpoint(hierarchy_id: str):
-    """Supprime une hiérarchie de centre de travail"""
-    success = await delete_work_center_hierarchy(hierarchy_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Hiérarchie de centre de travail non trouvée")
-    return {"message": "Hiérarchie de centre de travail supprimée avec succès"}
+register_crud("/work-center-hierarchies", work_center_hierarchies_crud, "work_center_hierarchy", "hierarchy_id", "Hiérarchie de centre de travail supprimée avec succès", {
+    "create": "Crée une nouvelle hiérarchie de centre de travail",
+    "list": "Récupère toutes les hiérarchies de centres de travail",
+    "get": "Récupère une hiérarchie de centre de travail par ID",
+    "update": "Met à jour une hiérarchie de centre de travail",
+    "delete": "Supprime une hiérarchie de centre de travail",
+})
 
 # ============================================================================
 # ENDPOINTS POUR CENTRES DE TRAVAIL
 # ============================================================================
 
-@app.post("/work-centers/", response_model=WorkCenter)
-async def create_work_center_endpoint(work_center: WorkCenter):
-    """Crée un nouveau centre de travail"""
-    return await create_work_center(work_center)
-
-@app.get("/work-centers/", response_model=List[WorkCenter])
-async def get_all_work_centers_endpoint():
-    """Récupère tous les centres de travail"""
-    return await get_all_work_centers()
-
-@app.get("/work-centers/{work_center_id}", response_model=WorkCenter)
-async def get_work_center_endpoint(work_center_id: str):
-    """Récupère un centre de travail par ID"""
-    work_center = await get_work_center(work_center_id)
-    if not work_center:
-        raise HTTPException(status_code=404, detail="Centre de travail non trouvé")
-    return work_center
-
-@app.put("/work-centers/{work_center_id}", response_model=WorkCenter)
-async def update_work_center_endpoint(work_center_id: str, work_center: WorkCenter):
-    """Met à jour un centre de travail"""
-    return await update_work_center(work_center_id, work_center)
-
-@app.delete("/work-centers/{work_center_id}")
-async def delete_work_center_endpoint(work_center_id: str):
-    """Supprime un centre de travail"""
-    success = await delete_work_center(work_center_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Centre de travail non trouvé")
-    return {"message": "Centre de travail supprimé avec succès"}
+register_crud("/work-centers", work_centers_crud, "work_center", "work_center_id", "Centre de travail supprimé avec succès", {
+    "create": "Crée un nouveau centre de travail",
+    "list": "Récupère tous les centres de travail",
+    "get": "Récupère un centre de travail par ID",
+    "update": "Met à jour un centre de travail",
+    "delete": "Supprime un centre de travail",
+})
 
 # ============================================================================
 # ENDPOINTS POUR MATÉRIELS
 # ============================================================================
 
-@app.post("/materials/", response_model=Material)
-async def create_material_endpoint(material: Material):
-    """Crée un nouveau matériel"""
-    return await create_material(material)
-
-@app.get("/materials/", response_model=List[Material])
-async def get_all_materials_endpoint():
-    """Récupère tous les matériels"""
-    return await get_all_materials()
-
-@app.get("/materials/{material_id}", response_model=Material)
-async def get_material_endpoint(material_id: str):
-    """Récupère un matériel par ID"""
-    material = await get_material(material_id)
-    if not material:
-        raise HTTPException(status_code=404, detail="Matériel non trouvé")
-    return material
+@app.post("/materials/bulk", response_model=List[Material])
+async def create_many_materials_endpoint(materials: List[Material]):
+    """Crée plusieurs matériels en une seule écriture"""
+    return await create_many_materials(materials)
 
-@app.put("/materials/{material_id}", response_model=Material)
-async def update_material_endpoint(material_id: str, material: Material):
-    """Met à jour un matériel"""
-    return await update_material(material_id, material)
-
-@app.delete("/materials/{material_id}")
-async def delete_material_endpoint(material_id: str):
-    """Supprime un matériel"""
-    success = await delete_material(material_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Matériel non trouvé")
-    return {"message": "Matériel supprimé avec succès"}
+register_crud("/materials", materials_crud, "material", "material_id", "Matériel supprimé avec succès", {
+    "create": "Crée un nouveau matériel",
+    "list": "Récupère tous les matériels",
+    "get": "Récupère un matériel par ID",
+    "update": "Met à jour un matériel",
+    "delete": "Supprime un matériel",
+})
 
 # ============================================================================
 # ENDPOINTS POUR NOMENCLATURES
 # ============================================================================
 
-@app.post("/bill-of-materials/", response_model=BillOfMaterial)
-async def create_bill_of_material_endpoint(bom: BillOfMaterial):
-    """Crée une nouvelle nomenclature"""
-    return await create_bill_of_material(bom)
-
-@app.get("/bill-of-materials/", response_model=List[BillOfMaterial])
-async def get_all_bill_of_materials_endpoint():
-    """Récupère toutes les nomenclatures"""
-    return await get_all_bill_of_materials()
+@app.post("/bill-of-materials/batch", response_model=List[BillOfMaterial])
+async def get_many_bill_of_materials_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs nomenclatures par ID en une seule requête"""
+    return items_response(await get_many_bill_of_materials(ids))
 
-@app.get("/bill-of-materials/{bom_id}", response_model=BillOfMaterial)
-async def get_bill_of_material_endpoint(bom_id: str):
-    """Récupère une nomenclature par ID"""
-    bom = await get_bill_of_material(bom_id)
-    if not bom:
-        raise HTTPException(status_code=404, detail="Nomenclature non trouvée")
-    return bom
-
-@app.put("/bill-of-materials/{bom_id}", response_model=BillOfMaterial)
-async def update_bill_of_material_endpoint(bom_id: str, bom: BillOfMaterial):
-    """Met à jour une nomenclature"""
-    return await update_bill_of_material(bom_id, bom)
-
-@app.delete("/bill-of-materials/{bom_id}")
-async def delete_bill_of_material_endpoint(bom_id: str):
-    """Supprime une nomenclature"""
-    success = await delete_bill_of_material(bom_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Nomenclature non trouvée")
-    return {"message": "Nomenclature supprimée avec succès"}
+register_crud("/bill-of-materials", bill_of_materials_crud, "bill_of_material", "bom_id", "Nomenclature supprimée avec succès", {
+    "create": "Crée une nouvelle nomenclature",
+    "list": "Récupère toutes les nomenclatures",
+    "get": "Récupère une nomenclature par ID",
+    "update": "Met à jour une nomenclature",
+    "delete": "Supprime une nomenclature",
+})
 
 # ============================================================================
 # ENDPOINTS POUR POSTES TECHNIQUES
 # ============================================================================
 
-@app.post("/functional-locations/", response_model=FunctionalLocation)
-async def create_functional_location_endpoint(fl: FunctionalLocation):
-    """Crée un nouveau poste technique"""
-    return await create_functional_location(fl)
-
-@app.get("/functional-locations/", response_model=List[FunctionalLocation])
-async def get_all_functional_locations_endpoint():
-    """Récupère tous les postes techniques"""
-    return await get_all_functional_locations()
-
-@app.get("/functional-locations/{fl_id}", response_model=FunctionalLocation)
-async def get_functional_location_endpoint(fl_id: str):
-    """Récupère un poste technique par ID"""
-    fl = await get_functional_location(fl_id)
-    if not fl:
-        raise HTTPException(status_code=404, detail="Poste technique non trouvé")
-    return fl
+@app.put("/functional-locations/bulk", response_model=List[FunctionalLocation])
+async def upsert_many_functional_locations_endpoint(functional_locations: List[FunctionalLocation]):
+    """Crée ou remplace plusieurs postes techniques (clé: ID) en une seule écriture"""
+    return await upsert_many_functional_locations(functional_locations)
 
-@app.put("/functional-locations/{fl_id}", response_model=FunctionalLocation)
-async def update_functional_location_endpoint(fl_id: str, fl: FunctionalLocation):
-    """Met à jour un poste technique"""
-    return await update_functional_location(fl_id, fl)
-
-@app.delete("/functional-locations/{fl_id}")
-async def delete_functional_location_endpoint(fl_id: str):
-    """Supprime un poste technique"""
-    success = await delete_functional_location(fl_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Poste technique non trouvé")
-    return {"message": "Poste technique supprimé avec succès"}
+register_crud("/functional-locations", functional_locations_crud, "functional_location", "fl_id", "Poste technique supprimé avec succès", {
+    "create": "Crée un nouveau poste technique",
+    "list": "Récupère tous les postes techniques",
+    "get": "Récupère un poste technique par ID",
+    "update": "Met à jour un poste technique",
+    "delete": "Supprime un poste technique",
+})
 
 # ============================================================================
 # ENDPOINTS POUR ÉQUIPEMENTS
 # ============================================================================
 
-@app.post("/equipment/", response_model=Equipment)
-async def create_equipment_endpoint(equipment: Equipment):
-    """Crée un nouvel équipement"""
-    return await create_equipment(equipment)
+@app.post("/equipment/bulk", response_model=List[Equipment])
+async def create_many_equipment_endpoint(equipment: List[Equipment]):
+    """Crée plusieurs équipements en une seule écriture"""
+    return await create_many_equipment(equipment)
 
-@app.get("/equipment/", response_model=List[Equipment])
-async def get_all_equipment_endpoint():
-    """Récupère tous les équipements"""
-    return await get_all_equipment()
+@app.put("/equipment/bulk", response_model=List[Equipment])
+async def upsert_many_equipment_endpoint(equipment: List[Equipment]):
+    """Crée ou remplace plusieurs équipements (clé: ID) en une seule écriture"""
+    return await upsert_many_equipment(equipment)
 
-@app.get("/equipment/{equipment_id}", response_model=Equipment)
-async def get_equipment_endpoint(equipment_id: str):
-    """Récupère un équipement par ID"""
-    equipment = await get_equipment(equipment_id)
+@app.get("/equipment/{equipment_id}/full")
+async def get_equipment_full_endpoint(equipment_id: str):
+    """Récupère un équipement avec ses nomenclatures, points de mesure et gammes"""
+    equipment = await get_equipment_full(equipment_id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Équipement non trouvé")
     return equipment
 
-@app.put("/equipment/{equipment_id}", response_model=Equipment)
-async def update_equipment_endpoint(equipment_id: str, equipment: Equipment):
-    """Met à jour un équipement"""
-    return await update_equipment(equipment_id, equipment)
+register_crud("/equipment", equipment_crud, "equipment", "equipment_id", "Équipement supprimé avec succès", {
+    "create": "Crée un nouvel équipement",
+    "list": "Récupère tous les équipements",
+    "get": "Récupère un équipement par ID",
+    "update": "Met à jour un équipement",
+    "delete": "Supprime un équipement",
+})
 
-@app.delete("/equipment/{equipment_id}")
-async def delete_equipment_endpoint(equipment_id: str):
-    """Supprime un équipement"""
-    success = await delete_equipment(equipment_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Équipement non trouvé")
-    return {"message": "Équipement supprimé avec succès"}
+@app.get("/equipment/functional-location/{functional_location_id}", response_model=List[Equipment])
+async def get_equipment_by_functional_location_endpoint(functional_location_id: str):
+    """Récupère les équipements installés sur un poste technique"""
+    return items_response(await get_equipment_by_functional_location(functional_location_id))
 
 # ============================================================================
 # ENDPOINTS POUR POINTS DE MESURE
 # ============================================================================
 
-@app.post("/measuring-points/", response_model=MeasuringPoint)
-async def create_measuring_point_endpoint(mp: MeasuringPoint):
-    """Crée un nouveau point de mesure"""
-    return await create_measuring_point(mp)
-
-@app.get("/measuring-points/", response_model=List[MeasuringPoint])
-async def get_all_measuring_points_endpoint():
-    """Récupère tous les points de mesure"""
-    return await get_all_measuring_points()
-
-@app.get("/measuring-points/{mp_id}", response_model=MeasuringPoint)
-async def get_measuring_point_endpoint(mp_id: str):
-    """Récupère un point de mesure par ID"""
-    mp = await get_measuring_point(mp_id)
-    if not mp:
-        raise HTTPException(status_code=404, detail="Point de mesure non trouvé")
-    return mp
+@app.post("/measuring-points/bulk", response_model=List[MeasuringPoint])
+async def create_many_measuring_points_endpoint(measuring_points: List[MeasuringPoint]):
+    """Crée plusieurs points de mesure en une seule écriture"""
+    return await create_many_measuring_points(measuring_points)
 
-@app.put("/measuring-points/{mp_id}", response_model=MeasuringPoint)
-async def update_measuring_point_endpoint(mp_id: str, mp: MeasuringPoint):
-    """Met à jour un point de mesure"""
-    return await update_measuring_point(mp_id, mp)
+register_crud("/measuring-points", measuring_points_crud, "measuring_point", "mp_id", "Point de mesure supprimé avec succès", {
+    "create": "Crée un nouveau point de mesure",
+    "list": "Récupère tous les points de mesure",
+    "get": "Récupère un point de mesure par ID",
+    "update": "Met à jour un point de mesure",
+    "delete": "Supprime un point de mesure",
+})
 
-@app.delete("/measuring-points/{mp_id}")
-async def delete_measuring_point_endpoint(mp_id: str):
-    """Supprime un point de mesure"""
-    success = await delete_measuring_point(mp_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Point de mesure non trouvé")
-    return {"message": "Point de mesure supprimé avec succès"}
+@app.get("/measuring-points/object/{target_object_id}", response_model=List[MeasuringPoint])
+async def get_measuring_points_by_object_endpoint(target_object_id: str):
+    """Récupère les points de mesure d'un objet cible"""
+    return items_response(await get_measuring_points_by_object(target_object_id))
 
 # ============================================================================
 # ENDPOINTS POUR COMPTEURS
 # ============================================================================
 
-@app.post("/counters/", response_model=Counter)
-async def create_counter_endpoint(counter: Counter):
-    """Crée un nouveau compteur"""
-    return await create_counter(counter)
+@app.post("/counters/bulk", response_model=List[Counter])
+async def create_many_counters_endpoint(counters: List[Counter]):
+    """Crée plusieurs compteurs en une seule écriture"""
+    return await create_many_counters(counters)
 
-@app.get("/counters/", response_model=List[Counter])
-async def get_all_counters_endpoint():
-    """Récupère tous les compteurs"""
-    return await get_all_counters()
+register_crud("/counters", counters_crud, "counter", "counter_id", "Compteur supprimé avec succès", {
+    "create": "Crée un nouveau compteur",
+    "list": "Récupère tous les compteurs",
+    "get": "Récupère un compteur par ID",
+    "update": "Met à jour un compteur",
+    "delete": "Supprime un compteur",
+})
 
-@app.get("/counters/{counter_id}", response_model=Counter)
-async def get_counter_endpoint(counter_id: str):
-    """Récupère un compteur par ID"""
-    counter = await get_counter(counter_id)
-    if not counter:
-        raise HTTPException(status_code=404, detail="Compteur non trouvé")
-    return counter
-
-@app.put("/counters/{counter_id}", response_model=Counter)
-async def update_counter_endpoint(counter_id: str, counter: Counter):
-    """Met à jour un compteur"""
-    return await update_counter(counter_id, counter)
-
-@app.delete("/counters/{counter_id}")
-async def delete_counter_endpoint(counter_id: str):
-    """Supprime un compteur"""
-    success = await delete_counter(counter_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Compteur non trouvé")
-    return {"message": "Compteur supprimé avec succès"}
+@app.get("/counters/object/{target_object_id}", response_model=List[Counter])
+async def get_counters_by_object_endpoint(target_object_id: str):
+    """Récupère les compteurs d'un objet cible"""
+    return items_response(await get_counters_by_object(target_object_id))
 
 # ============================================================================
 # ENDPOINTS POUR NUMÉROS DE SÉRIE
 # ============================================================================
 
-@app.post("/serial-numbers/", response_model=SerialNumber)
-async def create_serial_number_endpoint(sn: SerialNumber):
-    """Crée un nouveau numéro de série"""
-    return await create_serial_number(sn)
-
-@app.get("/serial-numbers/", response_model=List[SerialNumber])
-async def get_all_serial_numbers_endpoint():
-    """Récupère tous les numéros de série"""
-    return await get_all_serial_numbers()
-
-@app.get("/serial-numbers/{sn_id}", response_model=SerialNumber)
-async def get_serial_number_endpoint(sn_id: str):
-    """Récupère un numéro de série par ID"""
-    sn = await get_serial_number(sn_id)
-    if not sn:
-        raise HTTPException(status_code=404, detail="Numéro de série non trouvé")
-    return sn
+@app.post("/serial-numbers/bulk", response_model=List[SerialNumber])
+async def create_many_serial_numbers_endpoint(serial_numbers: List[SerialNumber]):
+    """Crée plusieurs numéros de série en une seule écriture"""
+    return await create_many_serial_numbers(serial_numbers)
 
-@app.put("/serial-numbers/{sn_id}", response_model=SerialNumber)
-async def update_serial_number_endpoint(sn_id: str, sn: SerialNumber):
-    """Met à jour un numéro de série"""
-    return await update_serial_number(sn_id, sn)
+register_crud("/serial-numbers", serial_numbers_crud, "serial_number", "sn_id", "Numéro de série supprimé avec succès", {
+    "create": "Crée un nouveau numéro de série",
+    "list": "Récupère tous les numéros de série",
+    "get": "Récupère un numéro de série par ID",
+    "update": "Met à jour un numéro de série",
+    "delete": "Supprime un numéro de série",
+})
 
-@app.delete("/serial-numbers/{sn_id}")
-async def delete_serial_number_endpoint(sn_id: str):
-    """Supprime un numéro de série"""
-    success = await delete_serial_number(sn_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Numéro de série non trouvé")
-    return {"message": "Numéro de série supprimé avec succès"}
+@app.get("/serial-numbers/equipment/{equipment_id}", response_model=List[SerialNumber])
+async def get_serial_numbers_by_equipment_endpoint(equipment_id: str):
+    """Récupère les numéros de série d'un équipement"""
+    return items_response(await get_serial_numbers_by_equipment(equipment_id))
 
 # ============================================================================
 # ENDPOINTS POUR NOMENCLATURES DE POSTES TECHNIQUES
 # ============================================================================
 
-@app.post("/functional-location-boms/", response_model=FunctionalLocationBOM)
-async def create_functional_location_bom_endpoint(fl_bom: FunctionalLocationBOM):
-    """Crée une nouvelle nomenclature de poste technique"""
-    return await create_functional_location_bom(fl_bom)
+@app.post("/functional-location-boms/batch", response_model=List[FunctionalLocationBOM])
+async def get_many_functional_location_boms_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs nomenclatures de postes techniques par ID en une seule requête"""
+    return items_response(await get_many_functional_location_boms(ids))
 
-@app.get("/functional-location-boms/", response_model=List[FunctionalLocationBOM])
-async def get_all_functional_location_boms_endpoint():
-    """Récupère toutes les nomenclatures de postes techniques"""
-    return await get_all_functional_location_boms()
+register_crud("/functional-location-boms", functional_location_boms_crud, "functional_location_bom", "fl_bom_id", "Nomenclature de poste technique supprimée avec succès", {
+    "create": "Crée une nouvelle nomenclature de poste technique",
+    "list": "Récupère toutes les nomenclatures de postes techniques",
+    "get": "Récupère une nomenclature de poste technique par ID",
+    "update": "Met à jour une nomenclature de poste technique",
+    "delete": "Supprime une nomenclature de poste technique",
+})
 
-@app.get("/functional-location-boms/{fl_bom_id}", response_model=FunctionalLocationBOM)
-async def get_functional_location_bom_endpoint(fl_bom_id: str):
-    """Récupère une nomenclature de poste technique par ID"""
-    fl_bom = await get_functional_location_bom(fl_bom_id)
-    if not fl_bom:
-        raise HTTPException(status_code=404, detail="Nomenclature de poste technique non trouvée")
-    return fl_bom
-
-@app.put("/functional-location-boms/{fl_bom_id}", response_model=FunctionalLocationBOM)
-async def update_functional_location_bom_endpoint(fl_bom_id: str, fl_bom: FunctionalLocationBOM):
-    """Met à jour une nomenclature de poste technique"""
-    return await update_functional_location_bom(fl_bom_id, fl_bom)
-
-@app.delete("/functional-location-boms/{fl_bom_id}")
-async def delete_functional_location_bom_endpoint(fl_bom_id: str):
-    """Supprime une nomenclature de poste technique"""
-    success = await delete_functional_location_bom(fl_bom_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Nomenclature de poste technique non trouvée")
-    return {"message": "Nomenclature de poste technique supprimée avec succès"}
+@app.get("/functional-location-boms/functional-location/{functional_location_id}", response_model=List[FunctionalLocationBOM])
+async def get_boms_for_functional_location_endpoint(functional_location_id: str):
+    """Récupère les nomenclatures d'un poste technique"""
+    return items_response(await get_boms_for_functional_location(functional_location_id))
 
 # ============================================================================
 # ENDPOINTS POUR NOMENCLATURES D'ÉQUIPEMENTS
 # ============================================================================
 
-@app.post("/equipment-boms/", response_model=EquipmentBOM)
-async def create_equipment_bom_endpoint(eq_bom: EquipmentBOM):
-    """Crée une nouvelle nomenclature d'équipement"""
-    return await create_equipment_bom(eq_bom)
-
-@app.get("/equipment-boms/", response_model=List[EquipmentBOM])
-async def get_all_equipment_boms_endpoint():
-    """Récupère toutes les nomenclatures d'équipements"""
-    return await get_all_equipment_boms()
+@app.post("/equipment-boms/batch", response_model=List[EquipmentBOM])
+async def get_many_equipment_boms_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs nomenclatures d'équipements par ID en une seule requête"""
+    return items_response(await get_many_equipment_boms(ids))
 
-@app.get("/equipment-boms/{eq_bom_id}", response_model=EquipmentBOM)
-async def get_equipment_bom_endpoint(eq_bom_id: str):
-    """Récupère une nomenclature d'équipement par ID"""
-    eq_bom = await get_equipment_bom(eq_bom_id)
-    if not eq_bom:
-        raise HTTPException(status_code=404, detail="Nomenclature d'équipement non trouvée")
-    return eq_bom
+register_crud("/equipment-boms", equipment_boms_crud, "equipment_bom", "eq_bom_id", "Nomenclature d'équipement supprimée avec succès", {
+    "create": "Crée une nouvelle nomenclature d'équipement",
+    "list": "Récupère toutes les nomenclatures d'équipements",
+    "get": "Récupère une nomenclature d'équipement par ID",
+    "update": "Met à jour une nomenclature d'équipement",
+    "delete": "Supprime une nomenclature d'équipement",
+})
 
-@app.put("/equipment-boms/{eq_bom_id}", response_model=EquipmentBOM)
-async def update_equipment_bom_endpoint(eq_bom_id: str, eq_bom: EquipmentBOM):
-    """Met à jour une nomenclature d'équipement"""
-    return await update_equipment_bom(eq_bom_id, eq_bom)
-
-@app.delete("/equipment-boms/{eq_bom_id}")
-async def delete_equipment_bom_endpoint(eq_bom_id: str):
-    """Supprime une nomenclature d'équipement"""
-    success = await delete_equipment_bom(eq_bom_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Nomenclature d'équipement non trouvée")
-    return {"message": "Nomenclature d'équipement supprimée avec succès"}
+@app.get("/equipment-boms/equipment/{equipment_id}", response_model=List[EquipmentBOM])
+async def get_boms_for_equipment_endpoint(equipment_id: str):
+    """Récupère les nomenclatures d'un équipement"""
+    return items_response(await get_boms_for_equipment(equipment_id))
 
 # ============================================================================
 # ENDPOINTS POUR GAMMES GÉNÉRALES
 # ============================================================================
 
-@app.post("/general-task-lists/", response_model=GeneralTaskList)
-async def create_general_task_list_endpoint(gtl: GeneralTaskList):
-    """Crée une nouvelle gamme générale"""
-    return await create_general_task_list(gtl)
-
-@app.get("/general-task-lists/", response_model=List[GeneralTaskList])
-async def get_all_general_task_lists_endpoint():
-    """Récupère toutes les gammes générales"""
-    return await get_all_general_task_lists()
+@app.post("/general-task-lists/batch", response_model=List[GeneralTaskList])
+async def get_many_general_task_lists_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs gammes générales par ID en une seule requête"""
+    return items_response(await get_many_general_task_lists(ids))
 
-@app.get("/general-task-lists/{gtl_id}", response_model=GeneralTaskList)
-async def get_general_task_list_endpoint(gtl_id: str):
-    """Récupère une gamme générale par ID"""
-    gtl = await get_general_task_list(gtl_id)
-    if not gtl:
-        raise HTTPException(status_code=404, detail="Gamme générale non trouvée")
-    return gtl
-
-@app.put("/general-task-lists/{gtl_id}", response_model=GeneralTaskList)
-async def update_general_task_list_endpoint(gtl_id: str, gtl: GeneralTaskList):
-    """Met à jour une gamme générale"""
-    return await update_general_task_list(gtl_id, gtl)
-
-@app.delete("/general-task-lists/{gtl_id}")
-async def delete_general_task_list_endpoint(gtl_id: str):
-    """Supprime une gamme générale"""
-    success = await delete_general_task_list(gtl_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Gamme générale non trouvée")
-    return {"message": "Gamme générale supprimée avec succès"}
+register_crud("/general-task-lists", general_task_lists_crud, "general_task_list", "gtl_id", "Gamme générale supprimée avec succès", {
+    "create": "Crée une nouvelle gamme générale",
+    "list": "Récupère toutes les gammes générales",
+    "get": "Récupère une gamme générale par ID",
+    "update": "Met à jour une gamme générale",
+    "delete": "Supprime une gamme générale",
+})
 
 # ============================================================================
 # ENDPOINTS POUR GAMMES POUR ÉQUIPEMENTS
 # ============================================================================
 
-@app.post("/equipment-task-lists/", response_model=EquipmentTaskList)
-async def create_equipment_task_list_endpoint(etl: EquipmentTaskList):
-    """Crée une nouvelle gamme pour équipement"""
-    return await create_equipment_task_list(etl)
-
-@app.get("/equipment-task-lists/", response_model=List[EquipmentTaskList])
-async def get_all_equipment_task_lists_endpoint():
-    """Récupère toutes les gammes pour équipements"""
-    return await get_all_equipment_task_lists()
-
-@app.get("/equipment-task-lists/{etl_id}", response_model=EquipmentTaskList)
-async def get_equipment_task_list_endpoint(etl_id: str):
-    """Récupère une gamme pour équipement par ID"""
-    etl = await get_equipment_task_list(etl_id)
-    if not etl:
-        raise HTTPException(status_code=404, detail="Gamme pour équipement non trouvée")
-    return etl
+@app.post("/equipment-task-lists/batch", response_model=List[EquipmentTaskList])
+async def get_many_equipment_task_lists_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs gammes pour équipements par ID en une seule requête"""
+    return items_response(await get_many_equipment_task_lists(ids))
 
-@app.put("/equipment-task-lists/{etl_id}", response_model=EquipmentTaskList)
-async def update_equipment_task_list_endpoint(etl_id: str, etl: EquipmentTaskList):
-    """Met à jour une gamme pour équipement"""
-    return await update_equipment_task_list(etl_id, etl)
+register_crud("/equipment-task-lists", equipment_task_lists_crud, "equipment_task_list", "etl_id", "Gamme pour équipement supprimée avec succès", {
+    "create": "Crée une nouvelle gamme pour équipement",
+    "list": "Récupère toutes les gammes pour équipements",
+    "get": "Récupère une gamme pour équipement par ID",
+    "update": "Met à jour une gamme pour équipement",
+    "delete": "Supprime une gamme pour équipement",
+})
 
-@app.delete("/equipment-task-lists/{etl_id}")
-async def delete_equipment_task_list_endpoint(etl_id: str):
-    """Supprime une gamme pour équipement"""
-    success = await delete_equipment_task_list(etl_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Gamme pour équipement non trouvée")
-    return {"message": "Gamme pour équipement supprimée avec succès"}
+@app.get("/equipment-task-lists/equipment/{equipment_id}", response_model=List[EquipmentTaskList])
+async def get_task_lists_for_equipment_endpoint(equipment_id: str):
+    """Récupère les gammes d'un équipement"""
+    return items_response(await get_task_lists_for_equipment(equipment_id))
 
 # ============================================================================
 # ENDPOINTS POUR GAMMES POUR POSTES TECHNIQUES
 # ============================================================================
 
-@app.post("/functional-location-task-lists/", response_model=FunctionalLocationTaskList)
-async def create_functional_location_task_list_endpoint(fltl: FunctionalLocationTaskList):
-    """Crée une nouvelle gamme pour poste technique"""
-    return await create_functional_location_task_list(fltl)
+@app.post("/functional-location-task-lists/bulk", response_model=List[FunctionalLocationTaskList])
+async def create_many_functional_location_task_lists_endpoint(functional_location_task_lists: List[FunctionalLocationTaskList]):
+    """Crée plusieurs gammes pour postes techniques en une seule écriture"""
+    return await create_many_functional_location_task_lists(functional_location_task_lists)
 
-@app.get("/functional-location-task-lists/", response_model=List[FunctionalLocationTaskList])
-async def get_all_functional_location_task_lists_endpoint():
-    """Récupère toutes les gammes pour postes techniques"""
-    return await get_all_functional_location_task_lists()
+@app.put("/functional-location-task-lists/bulk")
+async def update_many_functional_location_task_lists_endpoint(functional_location_task_lists: List[FunctionalLocationTaskList]):
+    """Met à jour plusieurs gammes pour postes techniques en une seule écriture"""
+    return {"matched_count": await update_many_functional_location_task_lists(functional_location_task_lists)}
 
-@app.get("/functional-location-task-lists/{fltl_id}", response_model=FunctionalLocationTaskList)
-async def get_functional_location_task_list_endpoint(fltl_id: str):
-    """Récupère une gamme pour poste technique par ID"""
-    fltl = await get_functional_location_task_list(fltl_id)
-    if not fltl:
-        raise HTTPException(status_code=404, detail="Gamme pour poste technique non trouvée")
-    return fltl
+@app.post("/functional-location-task-lists/bulk-delete")
+async def delete_many_functional_location_task_lists_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs gammes pour postes techniques en une seule écriture"""
+    return {"deleted_count": await delete_many_functional_location_task_lists(ids)}
 
-@app.put("/functional-location-task-lists/{fltl_id}", response_model=FunctionalLocationTaskList)
-async def update_functional_location_task_list_endpoint(fltl_id: str, fltl: FunctionalLocationTaskList):
-    """Met à jour une gamme pour poste technique"""
-    return await update_functional_location_task_list(fltl_id, fltl)
+register_crud("/functional-location-task-lists", functional_location_task_lists_crud, "functional_location_task_list", "fltl_id", "Gamme pour poste technique supprimée avec succès", {
+    "create": "Crée une nouvelle gamme pour poste technique",
+    "list": "Récupère toutes les gammes pour postes techniques",
+    "get": "Récupère une gamme pour poste technique par ID",
+    "update": "Met à jour une gamme pour poste technique",
+    "delete": "Supprime une gamme pour poste technique",
+})
 
-@app.delete("/functional-location-task-lists/{fltl_id}")
-async def delete_functional_location_task_list_endpoint(fltl_id: str):
-    """Supprime une gamme pour poste technique"""
-    success = await delete_functional_location_task_list(fltl_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Gamme pour poste technique non trouvée")
-    return {"message": "Gamme pour poste technique supprimée avec succès"}
+@app.get("/functional-location-task-lists/functional-location/{functional_location_id}", response_model=List[FunctionalLocationTaskList])
+async def get_task_lists_for_functional_location_endpoint(functional_location_id: str):
+    """Récupère les gammes d'un poste technique"""
+    return items_response(await get_task_lists_for_functional_location(functional_location_id))
 
 # ============================================================================
 # ENDPOINTS POUR PLANS À CYCLE SIMPLE
 # ============================================================================
 
-@app.post("/single-cycle-plans/", response_model=SingleCyclePlan)
-async def create_single_cycle_plan_endpoint(scp: SingleCyclePlan):
-    """Crée un nouveau plan à cycle simple"""
-    return await create_single_cycle_plan(scp)
+@app.post("/single-cycle-plans/bulk", response_model=List[SingleCyclePlan])
+async def create_many_single_cycle_plans_endpoint(single_cycle_plans: List[SingleCyclePlan]):
+    """Crée plusieurs plans à cycle simple en une seule écriture"""
+    return await create_many_single_cycle_plans(single_cycle_plans)
 
-@app.get("/single-cycle-plans/", response_model=List[SingleCyclePlan])
-async def get_all_single_cycle_plans_endpoint():
-    """Récupère tous les plans à cycle simple"""
-    return await get_all_single_cycle_plans()
+@app.put("/single-cycle-plans/bulk")
+async def update_many_single_cycle_plans_endpoint(single_cycle_plans: List[SingleCyclePlan]):
+    """Met à jour plusieurs plans à cycle simple en une seule écriture"""
+    return {"matched_count": await update_many_single_cycle_plans(single_cycle_plans)}
 
-@app.get("/single-cycle-plans/{scp_id}", response_model=SingleCyclePlan)
-async def get_single_cycle_plan_endpoint(scp_id: str):
-    """Récupère un plan à cycle simple par ID"""
-    scp = await get_single_cycle_plan(scp_id)
-    if not scp:
-        raise HTTPException(status_code=404, detail="Plan à cycle simple non trouvé")
-    return scp
+@app.post("/single-cycle-plans/bulk-delete")
+async def delete_many_single_cycle_plans_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs plans à cycle simple en une seule écriture"""
+    return {"deleted_count": await delete_many_single_cycle_plans(ids)}
 
-@app.put("/single-cycle-plans/{scp_id}", response_model=SingleCyclePlan)
-async def update_single_cycle_plan_endpoint(scp_id: str, scp: SingleCyclePlan):
-    """Met à jour un plan à cycle simple"""
-    return await update_single_cycle_plan(scp_id, scp)
-
-@app.delete("/single-cycle-plans/{scp_id}")
-async def delete_single_cycle_plan_endpoint(scp_id: str):
-    """Supprime un plan à cycle simple"""
-    success = await delete_single_cycle_plan(scp_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Plan à cycle simple non trouvé")
-    return {"message": "Plan à cycle simple supprimé avec succès"}
+register_crud("/single-cycle-plans", single_cycle_plans_crud, "single_cycle_plan", "scp_id", "Plan à cycle simple supprimé avec succès", {
+    "create": "Crée un nouveau plan à cycle simple",
+    "list": "Récupère tous les plans à cycle simple",
+    "get": "Récupère un plan à cycle simple par ID",
+    "update": "Met à jour un plan à cycle simple",
+    "delete": "Supprime un plan à cycle simple",
+})
 
 # ============================================================================
 # ENDPOINTS POUR PLANS DE MAINTENANCE STRATÉGIQUE
 # ============================================================================
 
-@app.post("/strategy-maintenance-plans/", response_model=StrategyMaintenancePlan)
-async def create_strategy_maintenance_plan_endpoint(smp: StrategyMaintenancePlan):
-    """Crée un nouveau plan de maintenance stratégique"""
-    return await create_strategy_maintenance_plan(smp)
-
-@app.get("/strategy-maintenance-plans/", response_model=List[StrategyMaintenancePlan])
-async def get_all_strategy_maintenance_plans_endpoint():
-    """Récupère tous les plans de maintenance stratégique"""
-    return await get_all_strategy_maintenance_plans()
+@app.post("/strategy-maintenance-plans/bulk", response_model=List[StrategyMaintenancePlan])
+async def create_many_strategy_maintenance_plans_endpoint(strategy_maintenance_plans: List[StrategyMaintenancePlan]):
+    """Crée plusieurs plans de maintenance par stratégie en une seule écriture"""
+    return await create_many_strategy_maintenance_plans(strategy_maintenance_plans)
 
-@app.get("/strategy-maintenance-plans/{smp_id}", response_model=StrategyMaintenancePlan)
-async def get_strategy_maintenance_plan_endpoint(smp_id: str):
-    """Récupère un plan de maintenance stratégique par ID"""
-    smp = await get_strategy_maintenance_plan(smp_id)
-    if not smp:
-        raise HTTPException(status_code=404, detail="Plan de maintenance stratégique non trouvé")
-    return smp
+@app.put("/strategy-maintenance-plans/bulk")
+async def update_many_strategy_maintenance_plans_endpoint(strategy_maintenance_plans: List[StrategyMaintenancePlan]):
+    """Met à jour plusieurs plans de maintenance par stratégie en une seule écriture"""
+    return {"matched_count": await update_many_strategy_maintenance_plans(strategy_maintenance_plans)}
 
-@app.put("/strategy-maintenance-plans/{smp_id}", response_model=StrategyMaintenancePlan)
-async def update_strategy_maintenance_plan_endpoint(smp_id: str, smp: StrategyMaintenancePlan):
-    """Met à jour un plan de maintenance stratégique"""
-    return await update_strategy_maintenance_plan(smp_id, smp)
+@app.post("/strategy-maintenance-plans/bulk-delete")
+async def delete_many_strategy_maintenance_plans_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs plans de maintenance par stratégie en une seule écriture"""
+    return {"deleted_count": await delete_many_strategy_maintenance_plans(ids)}
 
-@app.delete("/strategy-maintenance-plans/{smp_id}")
-async def delete_strategy_maintenance_plan_endpoint(smp_id: str):
-    """Supprime un plan de maintenance stratégique"""
-    success = await delete_strategy_maintenance_plan(smp_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Plan de maintenance stratégique non trouvé")
-    return {"message": "Plan de maintenance stratégique supprimé avec succès"}
+register_crud("/strategy-maintenance-plans", strategy_maintenance_plans_crud, "strategy_maintenance_plan", "smp_id", "Plan de maintenance stratégique supprimé avec succès", {
+    "create": "Crée un nouveau plan de maintenance stratégique",
+    "list": "Récupère tous les plans de maintenance stratégique",
+    "get": "Récupère un plan de maintenance stratégique par ID",
+    "update": "Met à jour un plan de maintenance stratégique",
+    "delete": "Supprime un plan de maintenance stratégique",
+})
 
 # ============================================================================
 # ENDPOINTS POUR PLANS À PLUSIEURS COMPTEURS
 # ============================================================================
 
-@app.post("/multiple-counter-plans/", response_model=MultipleCounterPlan)
-async def create_multiple_counter_plan_endpoint(mcp: MultipleCounterPlan):
-    """Crée un nouveau plan à plusieurs compteurs"""
-    return await create_multiple_counter_plan(mcp)
+@app.post("/multiple-counter-plans/bulk", response_model=List[MultipleCounterPlan])
+async def create_many_multiple_counter_plans_endpoint(multiple_counter_plans: List[MultipleCounterPlan]):
+    """Crée plusieurs plans à compteurs multiples en une seule écriture"""
+    return await create_many_multiple_counter_plans(multiple_counter_plans)
 
-@app.get("/multiple-counter-plans/", response_model=List[MultipleCounterPlan])
-async def get_all_multiple_counter_plans_endpoint():
-    """Récupère tous les plans à plusieurs compteurs"""
-    return await get_all_multiple_counter_plans()
+@app.put("/multiple-counter-plans/bulk")
+async def update_many_multiple_counter_plans_endpoint(multiple_counter_plans: List[MultipleCounterPlan]):
+    """Met à jour plusieurs plans à compteurs multiples en une seule écriture"""
+    return {"matched_count": await update_many_multiple_counter_plans(multiple_counter_plans)}
 
-@app.get("/multiple-counter-plans/{mcp_id}", response_model=MultipleCounterPlan)
-async def get_multiple_counter_plan_endpoint(mcp_id: str):
-    """Récupère un plan à plusieurs compteurs par ID"""
-    mcp = await get_multiple_counter_plan(mcp_id)
-    if not mcp:
-        raise HTTPException(status_code=404, detail="Plan à plusieurs compteurs non trouvé")
-    return mcp
+@app.post("/multiple-counter-plans/bulk-delete")
+async def delete_many_multiple_counter_plans_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs plans à compteurs multiples en une seule écriture"""
+    return {"deleted_count": await delete_many_multiple_counter_plans(ids)}
 
-@app.put("/multiple-counter-plans/{mcp_id}", response_model=MultipleCounterPlan)
-async def update_multiple_counter_plan_endpoint(mcp_id: str, mcp: MultipleCounterPlan):
-    """Met à jour un plan à plusieurs compteurs"""
-    return await update_multiple_counter_plan(mcp_id, mcp)
-
-@app.delete("/multiple-counter-plans/{mcp_id}")
-async def delete_multiple_counter_plan_endpoint(mcp_id: str):
-    """Supprime un plan à plusieurs compteurs"""
-    success = await delete_multiple_counter_plan(mcp_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Plan à plusieurs compteurs non trouvé")
-    return {"message": "Plan à plusieurs compteurs supprimé avec succès"}
+register_crud("/multiple-counter-plans", multiple_counter_plans_crud, "multiple_counter_plan", "mcp_id", "Plan à plusieurs compteurs supprimé avec succès", {
+    "create": "Crée un nouveau plan à plusieurs compteurs",
+    "list": "Récupère tous les plans à plusieurs compteurs",
+    "get": "Récupère un plan à plusieurs compteurs par ID",
+    "update": "Met à jour un plan à plusieurs compteurs",
+    "delete": "Supprime un plan à plusieurs compteurs",
+})
 
 # ============================================================================
 # ENDPOINTS POUR VALEURS CARACTÉRISTIQUES
 # ============================================================================
 
-@app.post("/characteristic-values/", response_model=CharacteristicValues)
-async def create_characteristic_values_endpoint(cv: CharacteristicValues):
-    """Crée une nouvelle valeur caractéristique"""
-    return await create_characteristic_values(cv)
-
-@app.get("/characteristic-values/", response_model=List[CharacteristicValues])
-async def get_all_characteristic_values_endpoint():
-    """Récupère toutes les valeurs caractéristiques"""
-    return await get_all_characteristic_values()
+@app.post("/characteristic-values/bulk", response_model=List[CharacteristicValues])
+async def create_many_characteristic_values_endpoint(characteristic_values: List[CharacteristicValues]):
+    """Crée plusieurs valeurs de caractéristiques en une seule écriture"""
+    return await create_many_characteristic_values(characteristic_values)
 
-@app.get("/characteristic-values/{cv_id}", response_model=CharacteristicValues)
-async def get_characteristic_values_endpoint(cv_id: str):
-    """Récupère une valeur caractéristique par ID"""
-    cv = await get_characteristic_values(cv_id)
-    if not cv:
-        raise HTTPException(status_code=404, detail="Valeur caractéristique non trouvée")
-    return cv
+@app.put("/characteristic-values/bulk")
+async def update_many_characteristic_values_endpoint(characteristic_values: List[CharacteristicValues]):
+    """Met à jour plusieurs valeurs de caractéristiques en une seule écriture"""
+    return {"matched_count": await update_many_characteristic_values(characteristic_values)}
 
-@app.put("/characteristic-values/{cv_id}", response_model=CharacteristicValues)
-async def update_characteristic_values_endpoint(cv_id: str, cv: CharacteristicValues):
-    """Met à jour une valeur caractéristique"""
-    return await update_characteristic_values(cv_id, cv)
+@app.post("/characteristic-values/bulk-delete")
+async def delete_many_characteristic_values_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs valeurs de caractéristiques en une seule écriture"""
+    return {"deleted_count": await delete_many_characteristic_values(ids)}
 
-@app.delete("/characteristic-values/{cv_id}")
-async def delete_characteristic_values_endpoint(cv_id: str):
-    """Supprime une valeur caractéristique"""
-    success = await delete_characteristic_values(cv_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Valeur caractéristique non trouvée")
-    return {"message": "Valeur caractéristique supprimée avec succès"}
+register_crud("/characteristic-values", characteristic_values_crud, "characteristic_values", "cv_id", "Valeur caractéristique supprimée avec succès", {
+    "create": "Crée une nouvelle valeur caractéristique",
+    "list": "Récupère toutes les valeurs caractéristiques",
+    "get": "Récupère une valeur caractéristique par ID",
+    "update": "Met à jour une valeur caractéristique",
+    "delete": "Supprime une valeur caractéristique",
+})
 
 # ============================================================================
 # ENDPOINTS POUR NOTIFICATIONS
 # ============================================================================
 
-@app.post("/notifications/", response_model=Notification)
-async def create_notification_endpoint(notification: Notification):
-    """Crée une nouvelle notification"""
-    return await create_notification(notification)
-
-@app.get("/notifications/", response_model=List[Notification])
-async def get_all_notifications_endpoint():
-    """Récupère toutes les notifications"""
-    return await get_all_notifications()
-
-@app.get("/notifications/{notification_id}", response_model=Notification)
-async def get_notification_endpoint(notification_id: str):
-    """Récupère une notification par ID"""
-    notification = await get_notification(notification_id)
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification non trouvée")
-    return notification
-
-@app.put("/notifications/{notification_id}", response_model=Notification)
-async def update_notification_endpoint(notification_id: str, notification: Notification):
-    """Met à jour une notification"""
-    return await update_notification(notification_id, notification)
-
-@app.delete("/notifications/{notification_id}")
-async def delete_notification_endpoint(notification_id: str):
-    """Supprime une notification"""
-    success = await delete_notification(notification_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Notification non trouvée")
-    return {"message": "Notification supprimée avec succès"}
+@app.post("/notifications/bulk", response_model=List[Notification])
+async def create_many_notifications_endpoint(notifications: List[Notification]):
+    """Crée plusieurs notifications en une seule écriture"""
+    return await create_many_notifications(notifications)
+
+@app.put("/notifications/bulk")
+async def update_many_notifications_endpoint(notifications: List[Notification]):
+    """Met à jour plusieurs notifications en une seule écriture"""
+    return {"matched_count": await update_many_notifications(notifications)}
+
+@app.post("/notifications/bulk-delete")
+async def delete_many_notifications_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs notifications en une seule écriture"""
+    return {"deleted_count": await delete_many_notifications(ids)}
+
+@app.get("/notifications/filter", response_model=List[Notification])
+async def get_notifications_filtered_endpoint(equipment_id: Optional[List[str]] = Query(None), status: Optional[List[str]] = Query(None), priority: Optional[List[str]] = Query(None), skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Récupère les notifications filtrées par équipements, statuts et priorités (paramètres répétables)"""
+    return items_response(await get_notifications_filtered(equipment_id, status, priority, skip, limit))
+
+@app.get("/notifications/stats")
+async def get_notification_stats_endpoint():
+    """Compte les notifications par statut, priorité et type"""
+    return await get_notification_stats()
+
+@app.patch("/notifications/{notification_id}", response_model=Notification)
+async def patch_notification_endpoint(notification_id: str, changes: NotificationUpdate):
+    """Met à jour partiellement une notification (seuls les champs envoyés sont modifiés)"""
+    return await patch_notification(notification_id, changes)
+
+register_crud("/notifications", notifications_crud, "notification", "notification_id", "Notification supprimée avec succès", {
+    "create": "Crée une nouvelle notification",
+    "list": "Récupère toutes les notifications",
+    "get": "Récupère une notification par ID",
+    "update": "Met à jour une notification",
+    "delete": "Supprime une notification",
+})
 
 @app.get("/notifications/equipment/{equipment_id}", response_model=List[Notification])
-async def get_notifications_by_equipment_endpoint(equipment_id: str):
+async def get_notifications_by_equipment_endpoint(equipment_id: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère toutes les notifications pour un équipement"""
-    return await get_notifications_by_equipment(equipment_id)
+    return items_response(await get_notifications_by_equipment(equipment_id, skip, limit))
 
 @app.get("/notifications/status/{status}", response_model=List[Notification])
-async def get_notifications_by_status_endpoint(status: str):
+async def get_notifications_by_status_endpoint(status: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère toutes les notifications par statut"""
-    return await get_notifications_by_status(status)
+    return items_response(await get_notifications_by_status(status, skip, limit))
 
 @app.get("/notifications/priority/{priority}", response_model=List[Notification])
-async def get_notifications_by_priority_endpoint(priority: str):
+async def get_notifications_by_priority_endpoint(priority: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère toutes les notifications par priorité"""
-    return await get_notifications_by_priority(priority)
+    return items_response(await get_notifications_by_priority(priority, skip, limit))
 
 # ============================================================================
 # ENDPOINTS POUR ORDRES
 # ============================================================================
 
-@app.post("/orders/", response_model=Order)
-async def create_order_endpoint(order: Order):
-    """Crée un nouvel ordre"""
-    return await create_order(order)
+@app.post("/orders/bulk", response_model=List[Order])
+async def create_many_orders_endpoint(orders: List[Order]):
+    """Crée plusieurs ordres en une seule écriture"""
+    return await create_many_orders(orders)
+
+@app.put("/orders/bulk")
+async def update_many_orders_endpoint(orders: List[Order]):
+    """Met à jour plusieurs ordres en une seule écriture"""
+    return {"matched_count": await update_many_orders(orders)}
+
+@app.post("/orders/bulk-delete")
+async def delete_many_orders_endpoint(ids: List[str] = Body(...)):
+    """Supprime plusieurs ordres en une seule écriture"""
+    return {"deleted_count": await delete_many_orders(ids)}
 
 @app.get("/orders/", response_model=List[Order])
-async def get_all_orders_endpoint():
-    """Récupère tous les ordres"""
-    return await get_all_orders()
-
-@app.get("/orders/{order_id}", response_model=Order)
-async def get_order_endpoint(order_id: str):
-    """Récupère un ordre par ID"""
-    order = await get_order(order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Ordre non trouvé")
-    return order
-
-@app.put("/orders/{order_id}", response_model=Order)
-async def update_order_endpoint(order_id: str, order: Order):
-    """Met à jour un ordre"""
-    return await update_order(order_id, order)
-
-@app.delete("/orders/{order_id}")
-async def delete_order_endpoint(order_id: str):
-    """Supprime un ordre"""
-    success = await delete_order(order_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Ordre non trouvé")
-    return {"message": "Ordre supprimé avec succès"}
+async def get_all_orders_endpoint(skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), fields: Optional[List[str]] = Query(None), status: Optional[str] = None, after: Optional[str] = None):
+    """Récupère tous les ordres triés par ID
+
+    Paramètre `fields` répétable pour ne renvoyer que certains champs. Pour les pages profondes,
+    passer dans `after` l'ID du dernier ordre reçu plutôt qu'un `skip` croissant.
+    """
+    query = {"status": status} if status else None
+    return list_response(iter_documents("orders", Order, skip, limit, fields, query, after))
+
+@app.post("/orders/batch", response_model=List[Order])
+async def get_many_orders_endpoint(ids: List[str] = Body(...)):
+    """Récupère plusieurs ordres par ID en une seule requête"""
+    return items_response(await get_many_orders(ids))
+
+@app.get("/orders/filter", response_model=List[Order])
+async def get_orders_filtered_endpoint(equipment_id: Optional[List[str]] = Query(None), status: Optional[List[str]] = Query(None), order_type: Optional[List[str]] = Query(None), work_center_id: Optional[List[str]] = Query(None), skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Récupère les ordres filtrés par équipements, statuts, types et centres de travail (paramètres répétables)"""
+    return items_response(await get_orders_filtered(equipment_id, status, order_type, work_center_id, skip, limit))
+
+@app.get("/orders/stats")
+async def get_order_stats_endpoint():
+    """Compte les ordres par statut, type et priorité"""
+    return await get_order_stats()
+
+@app.patch("/orders/{order_id}", response_model=Order)
+async def patch_order_endpoint(order_id: str, changes: OrderUpdate):
+    """Met à jour partiellement un ordre (seuls les champs envoyés sont modifiés)"""
+    return await patch_order(order_id, changes)
+
+register_crud("/orders", orders_crud, "order", "order_id", "Ordre supprimé avec succès", {
+    "create": "Crée un nouvel ordre",
+    "get": "Récupère un ordre par ID",
+    "update": "Met à jour un ordre",
+    "delete": "Supprime un ordre",
+})
 
 @app.get("/orders/equipment/{equipment_id}", response_model=List[Order])
-async def get_orders_by_equipment_endpoint(equipment_id: str):
+async def get_orders_by_equipment_endpoint(equipment_id: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère tous les ordres pour un équipement"""
-    return await get_orders_by_equipment(equipment_id)
+    return items_response(await get_orders_by_equipment(equipment_id, skip, limit))
+
+@app.post("/orders/equipment/batch", response_model=Dict[str, List[Order]])
+async def get_orders_for_equipments_endpoint(equipment_ids: List[str] = Body(...)):
+    """Récupère les ordres de plusieurs équipements en une seule requête, groupés par équipement"""
+    grouped = await get_orders_for_equipments(equipment_ids)
+    return ORJSONResponse({equipment_id: [order.model_dump() for order in orders] for equipment_id, orders in grouped.items()})
 
 @app.get("/orders/status/{status}", response_model=List[Order])
-async def get_orders_by_status_endpoint(status: str):
+async def get_orders_by_status_endpoint(status: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère tous les ordres par statut"""
-    return await get_orders_by_status(status)
+    return items_response(await get_orders_by_status(status, skip, limit))
+
+@app.get("/orders/status/{status}/summary", response_model=List[Dict[str, Any]])
+async def get_order_summaries_by_status_endpoint(status: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Récupère l'ID, le statut et l'équipement des ordres d'un statut (requête couverte par index)"""
+    return await get_order_summaries_by_status(status, skip, limit)
 
 @app.get("/orders/type/{order_type}", response_model=List[Order])
-async def get_orders_by_type_endpoint(order_type: str):
+async def get_orders_by_type_endpoint(order_type: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère tous les ordres par type"""
-    return await get_orders_by_type(order_type)
+    return items_response(await get_orders_by_type(order_type, skip, limit))
 
 @app.get("/orders/work-center/{work_center_id}", response_model=List[Order])
-async def get_orders_by_work_center_endpoint(work_center_id: str):
+async def get_orders_by_work_center_endpoint(work_center_id: str, skip: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Récupère tous les ordres pour un centre de travail"""
-    return await get_orders_by_work_center(work_center_id)
+    return items_response(await get_orders_by_work_center(work_center_id, skip, limit))
 
 # ============================================================================
 # ENDPOINTS GÉNÉRAUX
@@ -999,10 +802,25 @@ async def root():
     }
 
 @app.get("/all-data")
-async def get_all_data():
-    """Récupère toutes les données de la base"""
-    from database import get_all_data
-    return await get_all_data()
+async def get_all_data(limit: int = Query(ALL_DATA_MAX_DOCUMENTS, ge=1, le=ALL_DATA_MAX_DOCUMENTS), exclude: Optional[List[str]] = Query(None)):
+    """Récupère toutes les données de la base (`limit` documents au plus par collection)
+
+    Paramètre `exclude` répétable pour ne pas lire certains champs volumineux (ex. `description`).
+    La réponse est diffusée collection par collection: la mémoire reste bornée à un lot de documents.
+    """
+    # L'ID est indispensable à chaque document: refusé avant le début de la diffusion
+    if exclude and {"_id", "id"} & set(exclude):
+        raise HTTPException(status_code=422, detail="L'ID ne peut pas être exclu")
+    projection = {field: 0 for field in exclude} if exclude else None
+    async def encode():
+        separator = b"{"
+        for name in COLLECTIONS:
+            yield separator + orjson.dumps(name) + b":"
+            async for chunk in encode_list(iter_collection(name, limit, projection)):
+                yield chunk
+            separator = b","
+        yield b"}"
+    return StreamingResponse(encode(), media_type="application/json")
 
 @app.get("/health")
 async def health_check():
@@ -1014,4 +832,14 @@ async def health_check():
     }
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    # uvloop et httptools (installés avec uvicorn[standard], uvloop hors Windows) sont choisis
+    # explicitement; RELOAD=0 et WORKERS=N pour un lancement hors développement
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        reload=os.getenv("RELOAD", "1") == "1",
+        workers=int(os.getenv("WORKERS", "1")),
+    )
\ No newline at end of file
@@ -255,6 +255,22 @@ class Notification(BaseModel):
     completion_date: Optional[datetime] = Field(None, description="Date de completion")
     related_orders: List[str] = Field(default=[], description="Liste des IDs des ordres liés")
 
+class NotificationUpdate(BaseModel):
+    """Mise à jour partielle d'une notification: seuls les champs fournis sont modifiés"""
+    title: Optional[str] = Field(None, description="Titre de la notification")
+    description: Optional[str] = Field(None, description="Description détaillée de la notification")
+    status: Optional[NotificationStatus] = Field(None, description="Statut de la notification")
+    priority: Optional[NotificationPriority] = Field(None, description="Priorité de la notification")
+    notification_type: Optional[NotificationType] = Field(None, description="Type de notification")
+    equipment_id: Optional[str] = Field(None, description="ID de l'équipement concerné")
+    functional_location_id: Optional[str] = Field(None, description="ID du poste technique concerné")
+    work_center_id: Optional[str] = Field(None, description="ID du centre de travail responsable")
+    assigned_to: Optional[str] = Field(None, description="Utilisateur assigné à la notification")
+    estimated_duration: Optional[float] = Field(None, description="Durée estimée en heures")
+    actual_duration: Optional[float] = Field(None, description="Durée réelle en heures")
+    completion_date: Optional[datetime] = Field(None, description="Date de completion")
+    related_orders: Optional[List[str]] = Field(None, description="Liste des IDs des ordres liés")
+
 class Order(BaseModel):
     id: Optional[str] = Field(None, description="Identifiant unique de l'ordre")
     order_number: str = Field(..., description="Numéro d'ordre")
@@ -280,6 +296,29 @@ class Order(BaseModel):
     related_notifications: List[str] = Field(default=[], description="Liste des IDs des notifications liées")
     task_list_id: Optional[str] = Field(None, description="ID de la gamme associée")
 
+class OrderUpdate(BaseModel):
+    """Mise à jour partielle d'un ordre: seuls les champs fournis sont modifiés"""
+    order_number: Optional[str] = Field(None, description="Numéro d'ordre")
+    title: Optional[str] = Field(None, description="Titre de l'ordre")
+    description: Optional[str] = Field(None, description="Description détaillée de l'ordre")
+    status: Optional[OrderStatus] = Field(None, description="Statut de l'ordre")
+    order_type: Optional[OrderType] = Field(None, description="Type d'ordre")
+    equipment_id: Optional[str] = Field(None, description="ID de l'équipement concerné")
+    functional_location_id: Optional[str] = Field(None, description="ID du poste technique concerné")
+    work_center_id: Optional[str] = Field(None, description="ID du centre de travail responsable")
+    assigned_to: Optional[str] = Field(None, description="Utilisateur assigné à l'ordre")
+    planned_start_date: Optional[datetime] = Field(None, description="Date de début planifiée")
+    planned_end_date: Optional[datetime] = Field(None, description="Date de fin planifiée")
+    actual_start_date: Optional[datetime] = Field(None, description="Date de début réelle")
+    actual_end_date: Optional[datetime] = Field(None, description="Date de fin réelle")
+    estimated_duration: Optional[float] = Field(None, description="Durée estimée en heures")
+    actual_duration: Optional[float] = Field(None, description="Durée réelle en heures")
+    priority: Optional[NotificationPriority] = Field(None, description="Priorité de l'ordre")
+    cost_center: Optional[str] = Field(None, description="Centre de coûts")
+    materials_required: Optional[List[str]] = Field(None, description="Liste des IDs des matériaux requis")
+    related_notifications: Optional[List[str]] = Field(None, description="Liste des IDs des notifications liées")
+    task_list_id: Optional[str] = Field(None, description="ID de la gamme associée")
+
 # Modèles de réponse pour les listes
 class CatalogList(BaseModel):
     catalogs: List[Catalog]